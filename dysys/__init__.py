@@ -1,4 +1,60 @@
-from .sysdyn import *
-from .statespacesymbolic import *
-from .transferfunctionsymbolic import *
-from .controltf import *
\ No newline at end of file
+import importlib
+
+# Public names and their submodules. Submodules, and with them SymPy, SciPy,
+# python-control and friends, are imported on first attribute access
+# (PEP 562), so that importing dysys itself is fast.
+_lazy = {
+    "eigenvalue_matrix_np2sp": "sysdyn",
+    "modal_matrix_np2sp": "sysdyn",
+    "stability_from_eigenvalues": "modal",
+    "Stability": "modal",
+    "classify_stability": "modal",
+    "stability_many": "modal",
+    "eigvals_many": "modal",
+    "natural_frequencies": "modal",
+    "damping_ratios": "modal",
+    "time_constants": "modal",
+    "StateSpace": "sysdyn",
+    "StateSpaceSymbolic": "statespacesymbolic",
+    "sss": "statespacesymbolic",
+    "TransferFunctionSymbolic": "transferfunctionsymbolic",
+    "tfs": "transferfunctionsymbolic",
+    "FactorVerification": "controltf",
+    "TransferFunction": "controltf",
+    "pair_conjugates": "roots",
+    "factors_canonical_from_roots": "roots",
+    "poly_roots_many": "roots",
+    "limit_denominator": "roots",
+    "tf_factors_canonical": "controltf",
+    "factor_channels_canonical": "controltf",
+    "factor_canonical_many": "controltf",
+    "tf": "controltf",
+    "enable_disk_cache": "cache",
+    "disable_disk_cache": "cache",
+    "memo_info": "cache",
+    "memo_clear": "cache",
+    "memo_resize": "cache",
+}
+_submodules = {
+    "cache", "codegen", "controltf", "laplace", "modal", "parallel", "roots", 
+    "simplification", "simulation", "statespacesymbolic", "sysdyn", 
+    "transferfunctionsymbolic",
+}
+
+__all__ = list(_lazy)
+
+
+def __getattr__(name):
+    """Returns the public name or submodule, importing its submodule on first use"""
+    if name in _lazy:
+        value = getattr(importlib.import_module(f".{_lazy[name]}", __name__), name)
+    elif name in _submodules:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _submodules)
@@ -0,0 +1,217 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import NamedTuple
+import sympy as sp
+
+CACHE_VERSION = 2  # Bump to invalidate results stored by older versions
+
+
+class DiskCache:
+    """Persistent cache of pickled results in a directory, with LRU eviction
+
+    Each result is stored in its own file, named for the hash of its key.
+    Files are written to a temporary file and atomically renamed into place,
+    so several processes may share a directory safely. Reading a result
+    updates its file modification time, and when the directory grows beyond
+    max_bytes, the least recently used files are removed.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 2**20):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, name, args):
+        """Returns the key for function name and args, from their srepr"""
+        text = f"{CACHE_VERSION}:{name}:" + ":".join(sp.srepr(a) for a in args)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def __path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """Returns (True, value) if key is cached, else (False, None)"""
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass  # Evicted by another process meanwhile
+        return True, value
+
+    def set(self, key, value):
+        """Stores value for key, then evicts old results if needed"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.__path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used results until the size is at most max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed by another process
+            total -= size
+
+    def clear(self):
+        """Removes all cached results"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class MemoInfo(NamedTuple):
+    """Statistics of a MemoCache"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class MemoCache:
+    """Bounded in-process memo table with least-recently-used eviction
+
+    Keys are tuples of hashable objects, such as SymPy expressions, which 
+    hash structurally, so equal expressions built separately share entries.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__table = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Returns the value memoized for key, computing and storing it if needed"""
+        with self.__lock:
+            if key in self.__table:
+                self.hits += 1
+                self.__table.move_to_end(key)
+                return self.__table[key]
+            self.misses += 1
+        value = compute()  # Outside the lock, as it may be slow or reentrant
+        with self.__lock:
+            self.__table[key] = value
+            self.__table.move_to_end(key)
+            while len(self.__table) > self.maxsize:
+                self.__table.popitem(last=False)
+        return value
+
+    def info(self):
+        """Returns the hit and miss statistics as a MemoInfo"""
+        with self.__lock:
+            return MemoInfo(self.hits, self.misses, self.maxsize, len(self.__table))
+
+    def clear(self):
+        """Removes all entries and resets the statistics"""
+        with self.__lock:
+            self.__table.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_memo = MemoCache()  # Process-wide memo table of core symbolic operations
+
+
+def memoized(name, args, compute):
+    """Returns compute(), memoized process-wide under name and args"""
+    return _memo.get_or_compute((name,) + tuple(args), compute)
+
+
+def memo_info():
+    """Returns the hit and miss statistics of the process-wide memo table"""
+    return _memo.info()
+
+
+def memo_clear():
+    """Clears the process-wide memo table"""
+    _memo.clear()
+
+
+def memo_resize(maxsize):
+    """Sets the maximum number of entries of the process-wide memo table"""
+    _memo.maxsize = maxsize
+
+
+_disk_cache = None  # The active DiskCache, if enabled
+
+
+def enable_disk_cache(directory=None, max_bytes=512 * 2**20):
+    """Enables the persistent cache of expensive symbolic results
+
+    Args:
+        directory: The cache directory (Default: the DYSYS_CACHE_DIR
+            environment variable, or ~/.cache/dysys)
+        max_bytes: The size above which least recently used results are
+            evicted
+
+    Returns:
+        The DiskCache
+    """
+    global _disk_cache
+    if directory is None:
+        directory = os.environ.get(
+            "DYSYS_CACHE_DIR", os.path.join("~", ".cache", "dysys")
+        )
+    _disk_cache = DiskCache(directory, max_bytes=max_bytes)
+    return _disk_cache
+
+
+def disable_disk_cache():
+    """Disables the persistent cache (stored results are kept on disk)"""
+    global _disk_cache
+    _disk_cache = None
+
+
+def disk_cached(name, args, compute):
+    """Returns compute(), looked up in and stored to the disk cache if enabled
+
+    Args:
+        name: The name of the computation
+        args: Tuple of SymPy objects (or Python values with an srepr) that
+            determine the result
+        compute: Function of no arguments that computes the result
+    """
+    if _disk_cache is None:
+        return compute()
+    key = _disk_cache.key(name, args)
+    found, value = _disk_cache.get(key)
+    if not found:
+        value = compute()
+        _disk_cache.set(key, value)
+    return value
+
+
+if os.environ.get("DYSYS_CACHE_DIR"):
+    enable_disk_cache()
@@ -0,0 +1,253 @@
+import ctypes
+import os
+import shutil
+import subprocess
+import tempfile
+import sympy as sp
+import numpy as np
+
+BACKENDS = ("numpy", "numba", "c")
+
+
+def param_columns(params, values):
+    """Returns (columns, N): one 1D array of N values per parameter
+
+    Args:
+        params: Sequence of parameter symbols
+        values: The parameter values, given as one of
+            - a dict mapping each parameter (or its name) to a scalar or
+              an array of N values,
+            - a NumPy structured array with a field named for each parameter,
+            - an array-like of shape (N, len(params)), or of shape
+              (len(params),) for a single parameter set.
+    """
+    params = tuple(params)
+    if values is None:
+        values = {}
+    if isinstance(values, dict):
+        names = {str(k): v for k, v in values.items()}
+        columns = []
+        for p in params:
+            if p in values:
+                columns.append(np.asarray(values[p]))
+            elif str(p) in names:
+                columns.append(np.asarray(names[str(p)]))
+            else:
+                raise RuntimeError(f"No values given for parameter {p}")
+    elif isinstance(values, np.ndarray) and values.dtype.names is not None:
+        columns = [np.asarray(values[str(p)]) for p in params]
+    else:
+        values = np.asarray(values)
+        if values.ndim <= 1:
+            values = values.reshape(1, -1)
+        if values.shape[-1] != len(params):
+            raise RuntimeError(
+                f"Expected {len(params)} parameter values per set, "
+                f"got {values.shape[-1]}"
+            )
+        columns = [values[:, i] for i in range(len(params))]
+    if columns:
+        shape = np.broadcast_shapes(*(np.shape(c) for c in columns))
+        if len(shape) > 1:
+            raise RuntimeError("Parameter values must be scalars or 1D arrays")
+    else:
+        shape = ()
+    N = shape[0] if shape else 1
+    columns = [np.broadcast_to(c, (N,)) for c in columns]
+    return columns, N
+
+
+class CoefficientEvaluator:
+    """Evaluates lists of symbolic coefficients for batches of parameter values
+
+    The coefficient expressions are lambdified once, on construction, so
+    each call is a single vectorized NumPy evaluation with no SymPy
+    substitution.
+    """
+
+    def __init__(self, coeff_lists, params):
+        self.params = tuple(params)
+        self.sizes = tuple(len(cs) for cs in coeff_lists)
+        flat = [sp.sympify(c) for cs in coeff_lists for c in cs]
+        free = set().union(*(c.free_symbols for c in flat))
+        missing = {str(x) for x in free} - {str(p) for p in self.params}
+        if missing:
+            raise RuntimeError(f"No parameter given for symbols {sorted(missing)}")
+        self._f = sp.lambdify(self.params, flat, "numpy")
+
+    def __call__(self, values=None):
+        """Returns one array of shape (N, len(coeffs)) per coefficient list
+
+        Args:
+            values: Parameter values (see param_columns)
+        """
+        columns, N = param_columns(self.params, values)
+        flat = self._f(*columns)
+        flat = np.stack(
+            [np.broadcast_to(np.asarray(c, dtype=np.float64), (N,)) for c in flat],
+            axis=-1,
+        )
+        return tuple(np.split(flat, np.cumsum(self.sizes)[:-1], axis=-1))
+
+
+def horner(coeffs, x):
+    """Evaluates a batch of polynomials with Horner's method
+
+    Args:
+        coeffs: Array of shape (N, n) of coefficients, highest power first
+        x: Array of shape (M,) of points at which to evaluate
+
+    Returns:
+        Array of shape (N, M) with the value of each polynomial at each point
+    """
+    coeffs = np.atleast_2d(coeffs)
+    x = np.asarray(x)
+    y = np.zeros((coeffs.shape[0], x.shape[0]), dtype=np.result_type(coeffs, x))
+    for c in coeffs.T:
+        y *= x
+        y += c[:, np.newaxis]
+    return y
+
+
+class NumericFunction:
+    """Numerical function of an independent variable, e.g., time, and parameters
+
+    Compiled once from a SymPy expression or matrix of expressions, with
+    common subexpressions, such as the exponentials and sinusoids shared by
+    the entries of a response, eliminated across all entries so each is
+    evaluated once per point.
+
+    Backends:
+        - "numpy": sp.lambdify with cse=True; parameter values may be arrays
+          that broadcast with the variable, and may be complex where 
+          intermediate values are (e.g., the square root of a discriminant
+          that is negative for some parameter values),
+        - "numba": a Numba-compiled loop over the points (requires Numba),
+        - "c": a C loop over the points, compiled with the C compiler in 
+          the CC environment variable (Default: cc) and loaded with ctypes;
+          expressions must be real, without Heaviside or DiracDelta terms.
+        With the "numba" and "c" backends, parameter values must be scalars.
+
+    Args:
+        args: Sequence of the variable symbol followed by the parameter 
+            symbols, in the order their values are given
+        exprs: A SymPy expression or matrix of expressions
+        backend: One of BACKENDS (Default: "numpy")
+    """
+
+    def __init__(self, args, exprs, backend="numpy"):
+        self.args = tuple(args)
+        self.backend = backend
+        if isinstance(exprs, sp.MatrixBase):
+            self.shape = exprs.shape if exprs.cols > 1 else (exprs.rows,)
+            flat = list(exprs)
+        else:
+            self.shape = ()
+            flat = [sp.sympify(exprs)]
+        free = set().union(*(e.free_symbols for e in flat))
+        missing = {str(x) for x in free} - {str(a) for a in self.args}
+        if missing:
+            raise RuntimeError(f"No argument given for symbols {sorted(missing)}")
+        self.size = len(flat)
+        if backend == "numpy":
+            self._f = sp.lambdify(self.args, flat, "numpy", cse=True)
+        elif backend == "numba":
+            self._f = _compile_numba(self.args, flat)
+        elif backend == "c":
+            self._f = _compile_c(self.args, flat)
+        else:
+            raise RuntimeError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+
+    def __call__(self, x, *params):
+        """Returns the values at the points x, of shape self.shape + x.shape
+
+        Args:
+            x: Array of values of the variable
+            params: Values of the parameters, in the order of args
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.backend == "numpy":
+            values = self._f(x, *params)
+            shape = np.broadcast_shapes(*(np.shape(v) for v in values), x.shape)
+            out = np.stack([np.broadcast_to(v, shape) for v in values])
+            return out.reshape(self.shape + shape)
+        params = [float(p) for p in params]
+        out = self._f(np.ascontiguousarray(x.reshape(-1)), *params)
+        return out.reshape(self.shape + x.shape)
+
+
+def _compile_numba(args, flat):
+    """Returns a Numba-compiled f(x, *params) that returns shape (len(flat), N)"""
+    try:
+        import numba
+    except ImportError:
+        raise RuntimeError("The numba backend requires the numba package")
+    scalar = numba.njit(sp.lambdify(args, tuple(flat), "math", cse=True))
+    params = "".join(f", p{i}" for i in range(len(args) - 1))
+    lines = [
+        f"def loop(x{params}):",
+        f"    out = np.empty(({len(flat)}, x.shape[0]))",
+        "    for k in range(x.shape[0]):",
+        f"        values = scalar(x[k]{params})",
+    ] + [f"        out[{i}, k] = values[{i}]" for i in range(len(flat))] + [
+        "    return out",
+    ]
+    namespace = {"np": np, "scalar": scalar}
+    exec("\n".join(lines), namespace)
+    return numba.njit(namespace["loop"])
+
+
+def _compile_c(args, flat):
+    """Returns a ctypes-loaded C f(x, *params) that returns shape (len(flat), N)"""
+    for e in flat:
+        e = sp.sympify(e)
+        if e.has(sp.I) or any(n.is_real is False for n in e.atoms(sp.Number)):
+            raise RuntimeError(f"The C backend requires real expressions, not {e}")
+        if e.has(sp.Heaviside, sp.DiracDelta):
+            raise RuntimeError(
+                f"The C backend does not support Heaviside or DiracDelta in {e}"
+            )
+    names = [sp.Symbol(f"_a{i}", **a.assumptions0) for i, a in enumerate(args)]
+    flat = [sp.sympify(e).xreplace(dict(zip(args, names))) for e in flat]
+    replacements, reduced = sp.cse(flat, symbols=sp.numbered_symbols("_c"))
+    lines = ["#include <math.h>", ""]
+    lines.append(
+        "void dysys_numeric(long n, const double *x, const double *p, double *out) {"
+    )
+    lines += [f"    const double {a} = p[{i}];" for i, a in enumerate(names[1:])]
+    lines.append("    for (long k = 0; k < n; k++) {")
+    lines.append(f"        const double {names[0]} = x[k];")
+    lines += [
+        f"        const double {c} = {sp.ccode(e)};" for c, e in replacements
+    ]
+    lines += [
+        f"        out[{i}*n + k] = {sp.ccode(e)};" for i, e in enumerate(reduced)
+    ]
+    lines += ["    }", "}", ""]
+    directory = tempfile.mkdtemp(prefix="dysys-")
+    try:
+        source = os.path.join(directory, "numeric.c")
+        library = os.path.join(directory, "numeric.so")
+        with open(source, "w") as f:
+            f.write("\n".join(lines))
+        result = subprocess.run(
+            [os.environ.get("CC", "cc"), "-O2", "-shared", "-fPIC", source, 
+             "-o", library, "-lm"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"C compilation failed:\n{result.stderr}")
+        lib = ctypes.CDLL(library)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)  # The library stays loaded
+    c_f = lib.dysys_numeric
+    c_f.restype = None
+    c_f.argtypes = [ctypes.c_long] + [np.ctypeslib.ndpointer(np.float64)] * 3
+    size = len(flat)
+
+    def f(x, *params):
+        out = np.empty((size, len(x)))
+        c_f(len(x), x, np.array(params, dtype=np.float64), out)
+        return out
+    f.lib = lib  # Keeps the library loaded as long as f
+    return f
@@ -1,7 +1,18 @@
+import logging
+from typing import NamedTuple
 import control
-from scipy.signal import tf2zpk
 import numpy as np
 import numpy.polynomial.polynomial as poly
+from .roots import pair_conjugates, factors_canonical_from_roots, poly_roots_many
+
+logger = logging.getLogger(__name__)
+
+
+class FactorVerification(NamedTuple):
+    """Result of comparing a product of factors with a transfer function"""
+    ok: bool  # Whether every point is within tolerance
+    max_error: float  # Largest relative error over the points
+    w: np.ndarray  # The angular frequencies of the points
 
 class TransferFunction(control.TransferFunction):
     """Subclass of control.TransferFunction with extra methods"""
@@ -9,7 +20,9 @@ class TransferFunction(control.TransferFunction):
         """Pop the conjugate of a root in roots list
         
         Finds the closest root in roots to the complex conjugate of root.
-        Uses the "closest" metric of the Euclidean distance.
+        Uses the "closest" metric of the Euclidean distance. Kept only for 
+        backward compatibility; factoring pairs all roots at once with 
+        roots.pair_conjugates.
         """
         rootsa = np.array(roots)
         diff = root.conjugate() - rootsa
@@ -21,68 +34,168 @@ class TransferFunction(control.TransferFunction):
     def poly_factors_canonical(self, p):
         """Returns polynomial factors in canonical form"""
         p = poly.Polynomial(np.flip(p))  # Polynomials have increasing powers
-        n = p.degree()
-        roots = list(p.roots())
-        K = p.coef[-1]
-        factors = []
-        while roots:
-            root = roots.pop()
-            if np.iscomplex(root):
-                root_conj = self.pop_conjugate(root, roots)
-                factor = poly.polyfromroots([root, root_conj])  # $s^2 + 2\zeta\omega_n s + \omega_n^2$
-                factor = np.flip(np.real(factor))  # Should all be real
-                k = 1/factor[-1]  # Factor gain $1/w_n^2$
-                K = K/k  # Overall gain absorbing factor gain
-            else:
-                factor = poly.polyfromroots([root])
-                factor = np.flip(np.real(factor))  # $s + 1/\tau$
-                K = K*factor[-1]  # Overall gain absorbing $\tau$
-                factor = factor/factor[-1]  # $\tau s + 1$
-                k = 1  # Factor gain
-            factors.append((k, factor))
-        factors.insert(0, (K, np.array([1])))  ## Prepend the gain as the first factor
-        return factors
+        return factors_canonical_from_roots(p.roots(), p.coef[-1])
         
-    def factor_canonical(self, check=False):
-        """Returns a list of transfer functions in canonical form, the product of which equals self."""
+    def factor_canonical(self, check=False, rtol=1e-6):
+        """Returns a list of transfer functions in canonical form, the product of which equals self.
+
+        For MIMO systems, returns a dict mapping each channel (output index,
+        input index) to its list of factors. Each unique numerator and 
+        denominator polynomial is factored only once, so channels sharing a 
+        characteristic polynomial share the root finding.
+
+        Args:
+            check: If True, verifies the factors numerically at a few 
+                frequencies (see verify_factors) and raises an 
+                AssertionError if they do not match. If "exact", multiplies 
+                out the factors and compares coefficients (see 
+                check_factors), which is much slower. (Default: False)
+            rtol: Relative tolerance of the check=True verification
+        """
+        channels = [
+            (i, j) for i in range(self.noutputs) for j in range(self.ninputs)
+        ]
+        factors = factor_channels_canonical(
+            [(self.num[i][j], self.den[i][j]) for i, j in channels]
+        )
+        if check:
+            for (i, j), tf_factors in zip(channels, factors):
+                H = TransferFunction(self.num[i][j], self.den[i][j])
+                if check == "exact":
+                    H.check_factors(tf_factors)
+                else:
+                    result = H.verify_factors(tf_factors, rtol=rtol)
+                    assert result.ok, (
+                        f"Factors of channel {(i, j)} do not match, with "
+                        f"relative error {result.max_error}"
+                    )
         if self.ninputs > 1 or self.noutputs > 1:
-            raise NotImplementedError(
-                "TransferFunction.factor_canonical is currently only implemented "
-                "for SISO systems.")
-        zpf = self.poly_factors_canonical(np.array(self.num).flatten())  # Zero factors
-        ppf = self.poly_factors_canonical(np.array(self.den).flatten())  # Pole factors
-        gain = zpf.pop(0)[0]/ppf.pop(0)[0]
-        tf_factors = [control.TransferFunction([gain],[1])]
-        for zf in zpf:
-            tf_factors.append(
-                control.TransferFunction(zf[1], [1/zf[0]])
-            )
-        for pf in ppf:
-            tf_factors.append(
-                control.TransferFunction([1/pf[0]], pf[1])
+            return dict(zip(channels, factors))
+        return factors[0]
+
+    def verify_factors(self, tf_factors, w=None, rtol=1e-6):
+        """Returns a FactorVerification comparing the product of tf_factors with self
+
+        Evaluates self and each factor at s = jw for a few frequencies w, so 
+        no transfer function products or minimal realizations are formed. The 
+        result is also logged.
+
+        Args:
+            tf_factors: List of SISO transfer functions
+            w: Array of angular frequencies (Default: seven log-spaced 
+                frequencies spanning six decades around the geometric mean 
+                of the pole magnitudes)
+            rtol: Relative tolerance
+        """
+        num = np.trim_zeros(np.array(self.num[0][0], dtype=np.float64), "f")
+        den = np.trim_zeros(np.array(self.den[0][0], dtype=np.float64), "f")
+        if w is None:
+            scale = 1.0
+            if len(den) > 1 and den[-1] != 0:
+                scale = np.abs(den[-1] / den[0]) ** (1 / (len(den) - 1))
+            w = scale * np.logspace(-3, 3, 7)
+        w = np.asarray(w, dtype=np.float64)
+        s = 1j * w
+        H = np.polyval(num, s) / np.polyval(den, s)
+        H_factors = np.ones_like(s)
+        for f in tf_factors:
+            H_factors *= (
+                np.polyval(np.array(f.num[0][0], dtype=np.float64), s) 
+                / np.polyval(np.array(f.den[0][0], dtype=np.float64), s)
             )
-        if check:
-            tf_from_factors = 1
-            for tf in tf_factors:
-                tf_from_factors *= tf
-            tf_from_factors = tf_from_factors.minreal()
-            print("Is", self, "equal to", tf_from_factors, "?")
-            self_den_0 = np.array(self.den).flatten().astype(np.float64)[0]
-            assert(
-                np.allclose(
-                    np.array(tf_from_factors.num).flatten(), 
-                    np.array(self.num).flatten().astype(np.float64)/self_den_0
-                )
+        scale = np.maximum(np.abs(H), np.finfo(np.float64).tiny)
+        max_error = float(np.max(np.abs(H_factors - H) / scale))
+        ok = max_error <= rtol
+        logger.log(
+            logging.DEBUG if ok else logging.WARNING,
+            "Factors of %s %s (max relative error %g)", 
+            self, "match" if ok else "do not match", max_error,
+        )
+        return FactorVerification(ok, max_error, w)
+
+    def check_factors(self, tf_factors):
+        """Asserts that the product of the transfer functions tf_factors equals self
+
+        Multiplies out the factors and compares the coefficients of their 
+        minimal realization with those of self.
+        """
+        tf_from_factors = 1
+        for tf in tf_factors:
+            tf_from_factors *= tf
+        tf_from_factors = tf_from_factors.minreal()
+        logger.debug("Is %s equal to %s?", self, tf_from_factors)
+        self_den_0 = np.array(self.den).flatten().astype(np.float64)[0]
+        assert(
+            np.allclose(
+                np.array(tf_from_factors.num).flatten(), 
+                np.array(self.num).flatten().astype(np.float64)/self_den_0
             )
-            assert(
-                np.allclose(
-                    np.array(tf_from_factors.den).flatten(),
-                    np.array(self.den).flatten().astype(np.float64)/self_den_0
-                )
+        )
+        assert(
+            np.allclose(
+                np.array(tf_from_factors.den).flatten(),
+                np.array(self.den).flatten().astype(np.float64)/self_den_0
             )
-            print("Yep")
-        return tf_factors
-        
+        )
+
+
+def tf_factors_canonical(zpf, ppf):
+    """Returns canonical transfer function factors from zero and pole factors"""
+    gain = zpf[0][0]/ppf[0][0]
+    tf_factors = [control.TransferFunction([gain],[1])]
+    for zf in zpf[1:]:
+        tf_factors.append(
+            control.TransferFunction(zf[1], [1/zf[0]])
+        )
+    for pf in ppf[1:]:
+        tf_factors.append(
+            control.TransferFunction([1/pf[0]], pf[1])
+        )
+    return tf_factors
+
+
+def factor_channels_canonical(channels):
+    """Returns a list of the canonical factors of each (num, den) channel
+
+    Each unique polynomial among all numerators and denominators is 
+    factored once, with the roots of all of them found together (see
+    poly_roots_many).
+    """
+    unique = {}  # Polynomial coefficients (highest power first) to index
+    polys, keys = [], []
+    for num, den in channels:
+        for p in (num, den):
+            p = np.trim_zeros(np.asarray(p, dtype=np.float64).flatten(), "f")
+            key = tuple(p)
+            if key not in unique:
+                unique[key] = len(polys)
+                polys.append(p)
+            keys.append(unique[key])
+    roots = poly_roots_many(polys)
+    poly_factors = [
+        factors_canonical_from_roots(r, p[0] if len(p) else 0.0)
+        for p, r in zip(polys, roots)
+    ]
+    return [
+        tf_factors_canonical(poly_factors[keys[k]], poly_factors[keys[k + 1]])
+        for k in range(0, len(keys), 2)
+    ]
+
+
+def factor_canonical_many(tfs):
+    """Returns a list of the canonical factors of each SISO transfer function
+
+    Equivalent to [H.factor_canonical() for H in tfs], but with the roots of
+    all numerators and denominators found together (see 
+    factor_channels_canonical).
+    """
+    for H in tfs:
+        if H.ninputs > 1 or H.noutputs > 1:
+            raise NotImplementedError(
+                "factor_canonical_many is only implemented for SISO systems.")
+    return factor_channels_canonical([(H.num[0][0], H.den[0][0]) for H in tfs])
+
+
 def tf(*args, **kwargs):
     """Create a TransferFunction object"""
     return TransferFunction(*args, **kwargs)    
@@ -0,0 +1,153 @@
+from functools import lru_cache
+import math
+import sympy as sp
+from sympy.polys.polyerrors import UnsolvableFactorError
+
+
+@lru_cache(maxsize=256)
+def laplace_transform(u, t, s):
+    """Returns the Laplace transform U(s) of u(t), memoized for repeated inputs"""
+    return sp.laplace_transform(u, t, s, noconds=True)
+
+
+def merge_roots(*roots):
+    """Returns the union of root dicts {root: multiplicity}, adding multiplicities"""
+    merged = {}
+    for r in roots:
+        for p, m in r.items():
+            merged[p] = merged.get(p, 0) + m
+    return merged
+
+
+def cluster_roots(roots, rtol=1e-3):
+    """Returns a root dict with nearby floating-point roots merged
+
+    Numerical root finders split a root of multiplicity m into m roots 
+    spread by about eps**(1/m), whose residues are huge and cancel. Each 
+    cluster of numerical roots within rtol (relative to their magnitude, or
+    absolute below 1) of one another is replaced by its mean, with the total
+    multiplicity. Exact and symbolic roots are kept as they are.
+
+    Args:
+        roots: Dict of roots as keys and multiplicity as values
+        rtol: The relative tolerance within which roots are merged
+    """
+    merged = {}
+    clusters = []  # Lists of (value, root, multiplicity)
+    for p, m in roots.items():
+        p = sp.sympify(p)
+        if not (p.is_number and p.has(sp.Float)):
+            merged[p] = merged.get(p, 0) + m
+            continue
+        item = (complex(p), p, m)
+        near = [
+            c for c in clusters 
+            if any(abs(item[0] - v) <= rtol * max(1, abs(v)) for v, _, _ in c)
+        ]
+        clusters = [c for c in clusters if c not in near]
+        clusters.append(sum(near, []) + [item])
+    for c in clusters:
+        if len(c) == 1:
+            _, p, m = c[0]
+        else:  # fsum is exact, so conjugate clusters have conjugate means
+            m = sum(m_k for _, _, m_k in c)
+            re = math.fsum(v.real * m_k for v, _, m_k in c) / m
+            im = math.fsum(v.imag * m_k for v, _, m_k in c) / m
+            p = sp.Float(re) if im == 0 else sp.Float(re) + sp.I * sp.Float(im)
+        merged[p] = merged.get(p, 0) + m
+    return merged
+
+
+def residue_inverse(num, roots, s, t, gain=1):
+    """Returns the inverse Laplace transform of F(s) = num(s)/den(s)
+
+    The denominator is given by its root structure,
+    den(s) = gain * prod((s - p)**m for p, m in roots.items()), so no
+    polynomial root finding or partial fraction expansion is needed. The
+    residue of each pole p of multiplicity m contributes
+
+        sum_j r_j * t**(j - 1)/(j - 1)! * exp(p*t), j = 1, ..., m
+
+    with r_j = 1/(m - j)! * d^(m - j)/ds^(m - j) [(s - p)**m F(s)] at s = p.
+    Conjugate pole pairs are combined into real exponentially weighted
+    sinusoids, whatever the assumptions on t, which is taken to be real.
+    Any polynomial part of an improper F becomes DiracDelta terms.
+
+    Args:
+        num: The numerator polynomial expression in s
+        roots: Dict of the roots of the denominator as keys and multiplicity
+            as values, as returned by sp.roots
+        s: The Laplace variable
+        t: The time symbol
+        gain: The leading coefficient of the denominator
+    """
+    gain = sp.sympify(gain)
+    roots = {sp.sympify(p): m for p, m in roots.items()}
+    den = gain * sp.Mul(*[(s - p)**m for p, m in roots.items()])
+    q, num = sp.div(sp.Poly(num, s), sp.Poly(den, s))  # Polynomial part
+    real = gain.is_real and all(c.is_real for c in num.coeffs())
+    num = num.as_expr()
+    f = sp.Add(*[
+        c * sp.DiracDelta(t, k) if k > 0 else c * sp.DiracDelta(t)
+        for (k,), c in q.terms() if c != 0
+    ])
+    t_real = sp.Dummy("t", real=True)  # For real and imaginary parts
+    done = set()
+    for p, m in roots.items():
+        if p in done:
+            continue
+        g = num / gain  # (s - p)**m F(s), without cancellation
+        for p_other, m_other in roots.items():
+            if p_other != p:
+                g = g / (s - p_other)**m_other
+        term = 0
+        for j in range(1, m + 1):
+            r = sp.diff(g, s, m - j).subs(s, p) / sp.factorial(m - j)
+            r = sp.cancel(sp.expand(r))
+            term += r * t**(j - 1) / sp.factorial(j - 1)
+        p_conj = sp.conjugate(p)
+        if real and p.is_real is False and roots.get(p_conj) == m:
+            # term*exp(p*t) + conjugate = 2*Re(term*exp(p*t))
+            sigma, omega = p.as_real_imag()
+            term_re, term_im = (
+                sp.cancel(part.subs(t_real, t)) 
+                for part in sp.expand(term.subs(t, t_real)).as_real_imag()
+            )
+            f += 2 * sp.exp(sigma * t) * (
+                term_re * sp.cos(omega * t) - term_im * sp.sin(omega * t)
+            )
+            done.add(p_conj)
+        else:
+            f += term * sp.exp(p * t)
+        done.add(p)
+    if not t.is_nonnegative:
+        f = f * sp.Heaviside(t)  # Causal, as in sp.inverse_laplace_transform
+    return f
+
+
+@lru_cache(maxsize=256)
+def inverse_laplace_transform(F, s, t):
+    """Returns the inverse Laplace transform f(t) of F(s), memoized
+
+    Rational F with denominators SymPy can factor are inverted with
+    residue_inverse. Otherwise, F is inverted term by term with SymPy.
+    """
+    if F == 0:
+        return sp.S.Zero
+    if F.is_rational_function(s):
+        num, den = sp.fraction(sp.cancel(F))
+        den = sp.Poly(den, s)
+        try:
+            roots = sp.roots(den, strict=True)
+        except UnsolvableFactorError:
+            pass  # Roots not expressible in radicals
+        else:
+            return residue_inverse(num, roots, s, t, gain=den.LC())
+        F = sp.apart(F, s)
+    f = sp.Add(*[
+        sp.inverse_laplace_transform(term, s, t, noconds=True)
+        for term in sp.Add.make_args(F)
+    ])
+    if t.is_nonnegative:
+        f = f.subs(sp.Heaviside(t), 1)
+    return f
@@ -0,0 +1,88 @@
+from enum import IntEnum
+import numpy as np
+
+
+class Stability(IntEnum):
+    """Stability labels, ordered from stable to unstable"""
+    STABLE = 0
+    MARGINAL = 1
+    UNSTABLE = 2
+
+
+_stability_names = {
+    Stability.STABLE: "stable",
+    Stability.MARGINAL: "marginally stable",
+    Stability.UNSTABLE: "unstable",
+}
+
+
+def classify_stability(evals, tol=0.0):
+    """Returns the Stability labels of eigenvalue vectors as an int8 array
+
+    Only the largest real part (spectral abscissa) of each vector is needed:
+    a system is unstable if it exceeds tol, marginally stable if it is within
+    tol of zero, and stable otherwise.
+
+    Args:
+        evals: Array of eigenvalues of shape (..., n), e.g., (N, n) for N
+            systems
+        tol: The tolerance within which a real part is taken to be zero
+
+    Returns:
+        Array of shape (...) of Stability values
+    """
+    re = np.real(evals).astype(np.float64, copy=False)
+    abscissa = np.max(re, axis=-1, initial=-np.inf)  # No eigenvalues: stable
+    return (abscissa > tol).astype(np.int8) + (abscissa >= -tol)
+
+
+def stability_many(A, tol=0.0):
+    """Returns the Stability labels of a stack of A matrices of shape (N, n, n)
+
+    The eigenvalues are computed in one batched call (see eigvals_many).
+    """
+    return classify_stability(eigvals_many(A), tol=tol)
+
+
+def stability_from_eigenvalues(eval_list, tol=0.0):
+    """Returns the stability as str of from a list of eigenvalues"""
+    return _stability_names[Stability(classify_stability(eval_list, tol=tol))]
+
+
+def eigvals_many(A):
+    """Returns the eigenvalues of a stack of matrices of shape (N, n, n)
+
+    All N eigenvalue problems are solved in a single batched LAPACK call,
+    returning an array of shape (N, n).
+    """
+    return np.linalg.eigvals(np.asarray(A))
+
+
+def natural_frequencies(evals):
+    """Returns the natural frequencies |lambda| of continuous-time eigenvalues"""
+    return np.abs(evals)
+
+
+def damping_ratios(evals):
+    """Returns the damping ratios -Re(lambda)/|lambda| of continuous-time eigenvalues
+
+    The damping ratio of a zero eigenvalue is undefined and returned as nan.
+    """
+    evals = np.asarray(evals)
+    wn = np.abs(evals)
+    return np.divide(
+        -np.real(evals), wn, out=np.full(wn.shape, np.nan), where=wn > 0
+    )
+
+
+def time_constants(evals):
+    """Returns the time constants -1/Re(lambda) of continuous-time eigenvalues
+
+    Eigenvalues with zero real part have infinite time constants, and those
+    of unstable modes are negative.
+    """
+    real_parts = np.real(evals)
+    return np.divide(
+        -1.0, real_parts, out=np.full(real_parts.shape, np.inf),
+        where=real_parts != 0,
+    )
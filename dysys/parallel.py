@@ -0,0 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+import sympy as sp
+
+
+def applyfunc(M, f, processes=None):
+    """Returns M.applyfunc(f), optionally with the entries split among processes
+
+    Each nonzero entry is mapped independently, so slow per-entry operations,
+    such as integration or simplification, can run in parallel. Zero entries
+    are assumed to map to zero and are not sent to the workers.
+
+    Args:
+        M: A SymPy matrix
+        f: A picklable function of one expression, e.g., sp.simplify or a 
+            functools.partial of a module-level function
+        processes: If given, the number of worker processes among which to
+            split the entries
+    """
+    if processes is None or processes <= 1:
+        return M.applyfunc(f)
+    entries = list(M)
+    nonzero = [k for k, e in enumerate(entries) if e != 0]
+    if len(nonzero) <= 1:
+        return M.applyfunc(f)
+    with ProcessPoolExecutor(max_workers=min(processes, len(nonzero))) as pool:
+        values = pool.map(f, [entries[k] for k in nonzero])
+        for k, value in zip(nonzero, values):
+            entries[k] = value
+    return M.__class__(M.rows, M.cols, entries)
+
+
+def integrate(expr, limits):
+    """Returns sp.integrate(expr, limits), as a picklable function of expr"""
+    return sp.integrate(expr, limits)
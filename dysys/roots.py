@@ -0,0 +1,129 @@
+import numpy as np
+
+
+def pair_conjugates(roots):
+    """Returns (i_real, i_pairs): indices of the real roots and of conjugate pairs
+
+    Each root with positive imaginary part is paired with a root with 
+    negative imaginary part by sorting both sets on their real and imaginary 
+    parts and matching them in order, which is exact for the conjugate pairs
+    returned by eigenvalue solvers for real polynomials. Any pair that does
+    not match to within a tolerance is re-paired by closest conjugate.
+
+    Returns:
+        i_real, an array of indices, and i_pairs, an array of shape 
+        (n_pairs, 2) of indices of the upper and lower roots of each pair
+    """
+    roots = np.asarray(roots, dtype=np.complex128)
+    i_real = np.flatnonzero(roots.imag == 0)
+    i_upper = np.flatnonzero(roots.imag > 0)
+    i_lower = np.flatnonzero(roots.imag < 0)
+    if len(i_upper) != len(i_lower):
+        raise RuntimeError("Complex roots do not occur in conjugate pairs")
+    i_upper = i_upper[np.lexsort((roots[i_upper].imag, roots[i_upper].real))]
+    i_lower = i_lower[np.lexsort((-roots[i_lower].imag, roots[i_lower].real))]
+    mismatch = (
+        np.abs(roots[i_upper] - roots[i_lower].conjugate()) 
+        > 1e-9 * np.abs(roots[i_upper])
+    )
+    if np.any(mismatch):  # Closest-conjugate pairing for the rest
+        lower = list(i_lower[mismatch])
+        for k in np.flatnonzero(mismatch):
+            dist = np.abs(roots[i_upper[k]].conjugate() - roots[lower])
+            i_lower[k] = lower.pop(dist.argmin())
+    return i_real, np.stack([i_upper, i_lower], axis=-1).reshape(-1, 2)
+
+
+def factors_canonical_from_roots(roots, K):
+    """Returns polynomial factors in canonical form from roots and leading coefficient
+
+    The first factor is (K, np.array([1])) with the overall gain. Each real
+    root gives a factor (1, [tau, 1]) and each conjugate pair a factor 
+    (1/wn**2, [1, 2*zeta*wn, wn**2]), with coefficients highest power first.
+    Factors are ordered as the roots, from last to first.
+    """
+    roots = np.asarray(roots)
+    i_real, i_pairs = pair_conjugates(roots)
+    r = np.real(roots[i_real])  # $s + 1/\tau$ for each real root
+    lin = np.stack([-1 / r, np.ones_like(r)], axis=-1)  # $\tau s + 1$
+    p, q = roots[i_pairs[:, 0]], roots[i_pairs[:, 1]]
+    a1 = np.real(-(p + q))
+    a0 = np.real(p * q)  # $\omega_n^2$
+    quad = np.stack([np.ones_like(a0), a1, a0], axis=-1)  # $s^2 + 2\zeta\omega_n s + \omega_n^2$
+    K = K * np.prod(-r) * np.prod(a0)  # Overall gain absorbing $\tau$s and factor gains
+    factors = [(1, f) for f in lin] + [(1 / a, f) for a, f in zip(a0, quad)]
+    order = np.argsort(-np.concatenate([i_real, i_pairs.max(axis=1, initial=-1)]))
+    factors = [factors[i] for i in order]
+    factors.insert(0, (K, np.array([1])))  ## Prepend the gain as the first factor
+    return factors
+
+
+def poly_roots_many(polys):
+    """Returns a list of the roots of each polynomial in polys
+
+    Polynomials (coefficients highest power first) are grouped by degree, and 
+    the roots of each group are found with one stacked companion-matrix
+    eigenvalue solve, as in np.polynomial.polynomial.polyroots.
+    """
+    polys = [np.trim_zeros(np.asarray(p, dtype=np.float64), "f") for p in polys]
+    roots = [None] * len(polys)
+    by_degree = {}
+    for i, p in enumerate(polys):
+        by_degree.setdefault(max(len(p) - 1, 0), []).append(i)
+    for n, idx in by_degree.items():
+        if n == 0:
+            for i in idx:
+                roots[i] = np.array([])
+            continue
+        c = np.flip(np.stack([polys[i] for i in idx]), axis=-1)  # Increasing powers
+        companion = np.zeros((len(idx), n, n))
+        companion[:, np.arange(1, n), np.arange(n - 1)] = 1
+        companion[:, :, -1] -= c[:, :-1] / c[:, -1:]
+        r = np.sort(np.linalg.eigvals(companion), axis=-1)
+        for i, ri in zip(idx, r):
+            roots[i] = ri if np.any(np.iscomplex(ri)) else np.real(ri)
+    return roots
+
+
+def limit_denominator(x, max_denominator=10**6):
+    """Returns p, q: the closest fractions p/q to x with 0 < q <= max_denominator
+
+    Vectorized counterpart of fractions.Fraction.limit_denominator. The
+    continued fraction expansions of all elements of x are computed together,
+    each stopping when its next convergent would exceed max_denominator; the
+    best of the last convergent and semiconvergent is then selected.
+
+    Args:
+        x: Array-like of finite real numbers, of magnitude less than 2**62
+        max_denominator: The largest allowed denominator
+
+    Returns:
+        Integer arrays p and q of the shape of x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    sign = np.where(x < 0, -1, 1)
+    x = np.abs(x)
+    p0, q0 = np.zeros(x.shape, np.int64), np.ones(x.shape, np.int64)
+    p1, q1 = np.ones(x.shape, np.int64), np.zeros(x.shape, np.int64)
+    frac = x.copy()
+    active = np.ones(x.shape, bool)
+    while np.any(active):
+        # Partial quotient, bounded to avoid integer overflow; any value above
+        # max_denominator ends the expansion after the first term
+        a = np.floor(
+            np.minimum(frac, np.where(q1 > 0, max_denominator + 1, 2.0**62))
+        ).astype(np.int64)
+        q2 = q0 + a * q1
+        active &= q2 <= max_denominator
+        p0, q0, p1, q1 = (
+            np.where(active, p1, p0), np.where(active, q1, q0),
+            np.where(active, p0 + a * p1, p1), np.where(active, q2, q1),
+        )
+        rem = frac - a
+        active &= rem > 0  # Exact
+        frac = np.divide(1.0, rem, out=np.ones(x.shape), where=active)
+    # Semiconvergent (p0 + k p1)/(q0 + k q1) with the largest allowed k
+    k = (max_denominator - q0) // q1
+    ps, qs = p0 + k * p1, q0 + k * q1
+    semi = np.abs(ps / qs - x) < np.abs(p1 / q1 - x)
+    return sign * np.where(semi, ps, p1), np.where(semi, qs, q1)
@@ -0,0 +1,74 @@
+import multiprocessing
+import sympy as sp
+
+POLICIES = ("none", "cheap", "full")
+
+
+def cheap_simplify(expr):
+    """Returns expr simplified by a fast, predictable pipeline
+
+    Exponentials are expanded, the expression is combined over a common
+    denominator and cancelled, and exponentials are recombined. Unlike
+    sp.simplify, no trigonometric or other heuristic rewriting is tried.
+    """
+    expr = sp.together(sp.expand_power_exp(expr))
+    return sp.powsimp(sp.cancel(expr))
+
+
+def _simplifier(policy):
+    if policy not in POLICIES:
+        raise RuntimeError(
+            f"Unknown simplification policy {policy}, expected one of {POLICIES}"
+        )
+    return {"cheap": cheap_simplify, "full": sp.simplify}.get(policy)
+
+
+def _send_result(conn, f, expr):
+    conn.send(f(expr))
+    conn.close()
+
+
+def _call_with_timeout(f, expr, timeout):
+    """Returns f(expr) computed in a child process, or None after timeout seconds"""
+    recv, send = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_send_result, args=(send, f, expr))
+    process.start()
+    send.close()
+    try:
+        if recv.poll(timeout):
+            return recv.recv()
+        return None
+    except EOFError:  # The child failed
+        return None
+    finally:
+        process.terminate()
+        process.join()
+        recv.close()
+
+
+def simplify(expr, policy="full", timeout=None, budget=None):
+    """Returns expr simplified according to policy, within optional bounds
+
+    If a bound is exceeded, expr is returned unsimplified.
+
+    Args:
+        expr: The expression (apply to a matrix with applyfunc)
+        policy: One of
+            - "none": no simplification,
+            - "cheap": cheap_simplify,
+            - "full": sp.simplify.
+            (Default: "full")
+        timeout: If given, the number of seconds after which to abandon the
+            simplification, which then runs in a child process
+        budget: If given, the maximum operation count (sp.count_ops) of an
+            expression to simplify; larger expressions are left as they are
+    """
+    f = _simplifier(policy)
+    if f is None or not isinstance(expr, sp.Basic):
+        return expr
+    if budget is not None and sp.count_ops(expr) > budget:
+        return expr
+    if timeout is None:
+        return f(expr)
+    result = _call_with_timeout(f, expr, timeout)
+    return expr if result is None else result
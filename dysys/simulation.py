@@ -0,0 +1,170 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+def zoh_discretize(A, B, dt):
+    """Returns Ad, Bd: the zero-order-hold discretization of A and B
+
+    Uses a single matrix exponential of the augmented matrix [[A, B], [0, 0]]*dt.
+    A and B may also be stacks of shapes (N, n, n) and (N, n, m), in which 
+    case all N exponentials are computed in one call.
+    """
+    from scipy.linalg import expm  # Deferred, as SciPy is slow to import
+
+    n, m = B.shape[-2:]
+    M = np.zeros(A.shape[:-2] + (n + m, n + m))
+    M[..., :n, :n] = A
+    M[..., :n, n:] = B
+    eM = expm(M * dt)
+    return eM[..., :n, :n], eM[..., :n, n:]
+
+
+def uniform_step(t):
+    """Returns the step of the uniformly spaced time array t"""
+    t = np.asarray(t, dtype=np.float64)
+    if t.ndim != 1 or len(t) < 2:
+        raise RuntimeError("Time array must be 1D with at least two points")
+    dt = np.diff(t)
+    if not np.allclose(dt, dt[0], rtol=1e-9, atol=0):
+        raise RuntimeError("Time array must be uniformly spaced")
+    return dt[0]
+
+
+def input_array(u, m, N):
+    """Returns the input u as an array of shape (m, N)
+
+    Args:
+        u: None (zero input), a scalar, an array of shape (N,) for a single
+            input, or an array of shape (m, N)
+    """
+    if u is None:
+        return np.zeros((m, N))
+    u = np.asarray(u, dtype=np.float64)
+    if u.ndim <= 1:
+        u = np.broadcast_to(u, (N,)).reshape(1, N)
+    if u.shape != (m, N):
+        raise RuntimeError(f"Input must have shape ({m}, {N}), not {u.shape}")
+    return u
+
+
+def simulate_discrete(Ad, Bd, C, D, x0, u):
+    """Returns x, y: the state and output of a discrete-time system
+
+    Steps x[k+1] = Ad x[k] + Bd u[k] and y[k] = C x[k] + D u[k]. The input
+    contribution Bd u is computed for all steps at once, so the only Python
+    loop is the state recursion itself.
+
+    Args:
+        Ad, Bd, C, D: The discrete-time system matrices
+        x0: The initial state, of shape (n,)
+        u: The input, of shape (m, N)
+
+    Returns:
+        x of shape (n, N) and y of shape (p, N)
+    """
+    N = u.shape[1]
+    w = Bd @ u  # Input contribution for every step, shape (n, N)
+    x = np.empty((Ad.shape[0], N))
+    x[:, 0] = x0
+    for k in range(N - 1):
+        x[:, k + 1] = Ad @ x[:, k] + w[:, k]
+    y = C @ x + D @ u
+    return x, y
+
+
+def simulate_batch(Ad, Bd, C, D, x0, u, processes=None):
+    """Returns x, y: the states and outputs of N discrete-time systems
+
+    All N systems are stepped together, each step being one batched matrix
+    product over the stack.
+
+    Args:
+        Ad, Bd, C, D: Stacks of discrete-time system matrices, of shapes
+            (N, n, n), (N, n, m), (N, p, n) and (N, p, m)
+        x0: The initial state, of shape (n,) or (N, n) 
+        u: The input, of shape (m, T), shared by all systems, or (N, m, T)
+        processes: If given, the number of worker processes among which to
+            split the N systems
+
+    Returns:
+        x of shape (N, n, T) and y of shape (N, p, T)
+    """
+    N, n = Ad.shape[:2]
+    x0 = np.broadcast_to(x0, (N, n))
+    if processes is not None and processes > 1 and N > 1:
+        shards = np.array_split(np.arange(N), min(processes, N))
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            results = list(pool.map(
+                simulate_batch,
+                *zip(*[
+                    (Ad[i], Bd[i], C[i], D[i], x0[i], u if u.ndim == 2 else u[i])
+                    for i in shards
+                ]),
+            ))
+        return tuple(np.concatenate(r, axis=0) for r in zip(*results))
+    w = Bd @ u  # Input contribution for every step, shape (N, n, T)
+    T = u.shape[-1]
+    x = np.empty((N, n, T))
+    x[:, :, 0] = x0
+    for k in range(T - 1):
+        x[:, :, k + 1] = np.einsum("kij,kj->ki", Ad, x[:, :, k]) + w[:, :, k]
+    y = C @ x + D @ u
+    return x, y
+
+
+def input_chunks(u, m, chunk_size):
+    """Yields the input u in chunks of shape (m, L)
+
+    Args:
+        u: The input as an array of shape (N,) for a single input or (m, N),
+            including an np.memmap, which is sliced without being loaded, or 
+            an iterable of such arrays of any lengths
+        m: The number of inputs
+        chunk_size: The length of the chunks into which an array is split
+    """
+    if isinstance(u, np.ndarray):
+        chunks = (u[..., k:k + chunk_size] for k in range(0, u.shape[-1], chunk_size))
+    else:
+        chunks = u
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim <= 1:
+            chunk = chunk.reshape(1, -1)
+        if chunk.shape[0] != m:
+            raise RuntimeError(f"Input chunks must have {m} rows, not {chunk.shape[0]}")
+        if chunk.shape[1] > 0:
+            yield chunk
+
+
+def simulate_stream(
+        Ad, Bd, C, D, x0, u, chunk_size=65536, states=False, out=None
+    ):
+    """Yields the output of a discrete-time system chunk by chunk
+
+    The state is carried from the last step of each chunk to the first of
+    the next, so the result equals that of simulate_discrete over the whole
+    input, while memory use is bounded by the chunk length rather than the 
+    horizon.
+
+    Args:
+        Ad, Bd, C, D: The discrete-time system matrices
+        x0: The initial state, of shape (n,)
+        u: The input (see input_chunks)
+        chunk_size: The length of the chunks into which an input array is 
+            split
+        states: If True, yields (x, y) chunks instead of y chunks
+        out: If given, an array (e.g., an np.memmap) of shape (p, N) into 
+            which the output is also written
+
+    Yields:
+        y chunks of shape (p, L), or (x, y) chunks with x of shape (n, L)
+    """
+    x = np.asarray(x0, dtype=np.float64).reshape(-1)
+    k = 0  # First step of the chunk
+    for u_k in input_chunks(u, Bd.shape[1], chunk_size):
+        x_k, y_k = simulate_discrete(Ad, Bd, C, D, x, u_k)
+        x = Ad @ x_k[:, -1] + Bd @ u_k[:, -1]  # Initial state of the next chunk
+        if out is not None:
+            out[:, k:k + y_k.shape[1]] = y_k
+        k += y_k.shape[1]
+        yield (x_k, y_k) if states else y_k
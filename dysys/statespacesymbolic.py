@@ -1,16 +1,44 @@
+from functools import partial
 import sympy as sp
 import numpy as np
-import control
+from sympy.matrices.exceptions import MatrixError
+from sympy.matrices.sparse import SparseRepMatrix
+from .laplace import laplace_transform, inverse_laplace_transform
+from .cache import disk_cached
+from .codegen import CoefficientEvaluator, NumericFunction
+from .parallel import applyfunc, integrate
+from .simplification import simplify as simplify_expr
+from .simulation import (
+    zoh_discretize, uniform_step, input_array, simulate_discrete, simulate_batch,
+    simulate_stream,
+)
+
+
+_s = sp.Dummy("s")  # Private Laplace variable, distinct from any model symbol
+
+
+def _matrix(M):
+    """Returns M as a mutable SymPy matrix, keeping sparse matrices sparse"""
+    if isinstance(M, SparseRepMatrix):
+        return sp.SparseMatrix(M)
+    return sp.Matrix(M)
 
 
 class StateSpaceSymbolic:
-    """Represents a continuous LTI state-space model in symbolic form"""
+    """Represents a continuous LTI state-space model in symbolic form
+
+    The matrices may be given as SymPy SparseMatrix objects, which are kept
+    sparse. If A is block diagonal up to a permutation of the states (that
+    is, the model consists of decoupled subsystems), its eigenvectors, 
+    Jordan form, and state transition matrix are computed for each block
+    separately and assembled.
+    """
 
     def __init__(self, A, B, C, D, E=None, F=None):
-        self.A = sp.Matrix(A)
-        self.B = sp.Matrix(B)
-        self.C = sp.Matrix(C)
-        self.D = sp.Matrix(D)
+        self.A = _matrix(A)
+        self.B = _matrix(B)
+        self.C = _matrix(C)
+        self.D = _matrix(D)
         if E is None:
             self.E = sp.zeros(*self.B.shape)
         else:
@@ -23,10 +51,111 @@ class StateSpaceSymbolic:
             raise NotImplementedError(
                 "Methods not implemented for systems with E and F matrices"
             )
+        self.__cache = {}  # Results that depend only on A
+        self.__cache_A = None  # The A for which the cache is valid
+
+    def __cached(self, key, compute):
+        """Returns compute() for key, reusing the cached result while A is unchanged"""
+        A = self.A.as_immutable()
+        if A != self.__cache_A:  # A was reassigned or modified in place
+            self.__cache = {}
+            self.__cache_A = A
+        if key not in self.__cache:
+            self.__cache[key] = compute()
+        return self.__cache[key]
+
+    def blocks(self, triangular=False):
+        """Returns the state indices of each diagonal block of A
+
+        Args:
+            triangular: If False, the blocks are the decoupled subsystems, 
+                such that A is block diagonal after permuting its states. If
+                True, the blocks are the strongly coupled subsystems, such 
+                that A is block triangular after permuting its states. The
+                latter blocks are finer, but only determine the eigenvalues
+                (see eigenvals), as the eigenvectors and state transition
+                matrix also depend on the off-diagonal blocks.
+                (Default: False)
+        """
+        if triangular:
+            return self.__cached("scc", self.A.strongly_connected_components)
+        return self.__cached("cc", self.A.connected_components)
+
+    def __block_systems(self):
+        """Returns (indices, StateSpaceSymbolic) for each decoupled block of A
+
+        Each block system has its own caches, so its results are reused
+        whenever its block of A is unchanged.
+        """
+        def compute():
+            systems = []
+            for idx in self.blocks():
+                n = len(idx)
+                A = self.A.extract(idx, idx)
+                systems.append(
+                    (idx, StateSpaceSymbolic(A, A.zeros(n, 1), A.zeros(1, n), A.zeros(1, 1)))
+                )
+            return systems
+        return self.__cached("block_systems", compute)
+
+    def eigenvals(self):
+        """Returns a dict of the eigenvalues of A and their multiplicities
+
+        The eigenvalues are computed from the characteristic polynomials of 
+        the block-triangular blocks of A (see blocks), so the decomposition is 
+        exploited even when the subsystems are coupled one way.
+        """
+        def compute():
+            evals = {}
+            for idx in self.blocks(triangular=True):
+                for val, m in self.A.extract(idx, idx).eigenvals().items():
+                    evals[val] = evals.get(val, 0) + m
+            return evals
+        return dict(self.__cached("eigenvals", compute))
+
+    def __eigenvects_blocks(self):
+        """Returns the (eigenvalue, multiplicity, eigenvectors) list of A
+
+        For a decoupled A, each block's eigenvectors are padded with zeros 
+        for the other states, and equal eigenvalues of different blocks are
+        merged.
+        """
+        systems = self.__block_systems()
+        if len(systems) == 1:
+            return self.A.eigenvects()
+        n = self.A.shape[0]
+        merged = {}  # Eigenvalue: (multiplicity, basis)
+        for idx, system in systems:
+            for val, m, basis in system.__eigenvects():
+                vecs = []
+                for v in basis:
+                    w = self.A.zeros(n, 1)
+                    for i, vi in zip(idx, v):
+                        w[i] = vi
+                    vecs.append(w)
+                m_merged, basis_merged = merged.get(val, (0, []))
+                merged[val] = (m_merged + m, basis_merged + vecs)
+        return [(val, m, basis) for val, (m, basis) in merged.items()]
+
+    def __eigenvects(self, primitive=False):
+        """Returns the cached (eigenvalue, multiplicity, eigenvectors) list of A
+
+        If primitive is True, common integer denominators are removed from the
+        eigenvectors, as in SymPy's diagonalize().
+        """
+        if not primitive:
+            return self.__cached("eigenvects", self.__eigenvects_blocks)
+        return self.__cached(
+            "eigenvects_primitive",
+            lambda: [
+                (val, m, [(v / sp.gcd(list(v))).applyfunc(sp.simplify) for v in basis])
+                for val, m, basis in self.__eigenvects()
+            ],
+        )
 
     def eig(self):
         """Returns L, M: the eigenvalue and eigenvector matrices of A"""
-        eig = self.A.eigenvects()
+        eig = self.__eigenvects()
         L = sp.zeros(*self.A.shape)  # Initialize eigenvalue matrix
         M = sp.zeros(*self.A.shape)  # Initialize eigenvector matrix
         k = 0  # Eigen index
@@ -44,7 +173,8 @@ class StateSpaceSymbolic:
     def diag_transformation(self, reals_only=False, sort=True, normalize=False):
         """Return (P, D), where D is diagonal and D = P^-1 * self.A * P
 
-        This returns self.A.diagonalize() from SymPy.
+        This is equivalent to self.A.diagonalize() from SymPy, but reuses the
+        cached eigenvectors of A.
 
         Args:
             reals_only : bool. Whether to throw an error if complex numbers are need
@@ -54,12 +184,24 @@ class StateSpaceSymbolic:
 
             normalize : bool. If True, normalize the columns of P. (Default: False)
         """
-        return self.A.diagonalize(reals_only=reals_only, sort=sort, normalize=normalize)
+        if not self.is_diagonalizable(reals_only=reals_only):
+            raise MatrixError("Matrix is not diagonalizable")
+        eigenvecs = self.__eigenvects(primitive=True)
+        if sort:
+            eigenvecs = sorted(eigenvecs, key=sp.default_sort_key)
+        P_cols, L = [], []
+        for val, m, basis in eigenvecs:
+            L += [val] * m
+            P_cols += basis
+        if normalize:
+            P_cols = [v / v.norm() for v in P_cols]
+        return sp.Matrix.hstack(*P_cols), sp.diag(*L)
 
     def is_diagonalizable(self, reals_only=False, **kwargs):
         """Returns ``True`` if self.A is diagonalizable.
 
-        This returns self.A.is_diagonalizable() from SymPy.
+        This is equivalent to self.A.is_diagonalizable() from SymPy, but reuses 
+        the cached eigenvectors of A.
 
         Args:
             - reals_only : bool, optional
@@ -68,11 +210,138 @@ class StateSpaceSymbolic:
                 If ``False``, it tests whether the matrix can be diagonalized
                 at all, even with numbers that may not be real.
         """
-        return self.A.is_diagonalizable(reals_only=reals_only)
+        for val, m, basis in self.__eigenvects():
+            if reals_only and not val.is_real:
+                return False
+            if m != len(basis):  # Geometric multiplicity less than algebraic
+                return False
+        return True
 
-    def state_transition_matrix(self, t):
-        """Returns the state transition matrix"""
-        return sp.exp(self.A * t)  # This works for repeated roots, too
+    def jordan_form(self):
+        """Return (P, J), where J is in Jordan form and J = P^-1 * self.A * P
+
+        This returns self.A.jordan_form() from SymPy, cached until A changes.
+        For a decoupled A, the Jordan form of each block is computed 
+        separately, and J is the block diagonal matrix of the blocks' Jordan 
+        forms.
+        """
+        P, J = self.__cached(
+            "jordan_form",
+            lambda: tuple(M.as_immutable() for M in self.__jordan_form_blocks()),
+        )
+        return P.as_mutable(), J.as_mutable()
+
+    def __jordan_form_blocks(self):
+        """Returns (P, J), assembled from the Jordan form of each decoupled block"""
+        systems = self.__block_systems()
+        if len(systems) == 1:
+            return self.A.jordan_form()
+        n = self.A.shape[0]
+        P = self.A.zeros(n, n)
+        Js = []
+        k = 0  # First column of the block
+        for idx, system in systems:
+            P_k, J_k = system.jordan_form()
+            for row, i in enumerate(idx):
+                for col in range(len(idx)):
+                    P[i, k + col] = P_k[row, col]
+            Js.append(J_k)
+            k += len(idx)
+        return P, self.A.zeros(0, 0).diag(*Js)
+
+    def state_transition_matrix(self, t, method="auto", processes=None):
+        """Returns the state transition matrix
+        
+        The result is cached for each time symbol t and method until A changes.
+
+        Args:
+            t: The time symbol
+            method: How to compute the matrix exponential, one of
+                - "modal": Phi = P * diag(exp(L*t)) * P^-1 from 
+                  diag_transformation (A must be diagonalizable),
+                - "jordan": Phi = P * exp(J*t) * P^-1 from jordan_form, 
+                  which handles repeated eigenvalues,
+                - "exp": SymPy's generic exp(A*t),
+                - "auto": "modal" if A is diagonalizable, else "jordan".
+                (Default: "auto")
+                The "modal", "jordan", and "auto" methods raise a 
+                RuntimeError if the eigenvalues of A are not expressible in
+                radicals (CRootOf).
+                If A is decoupled (see blocks), the method is applied to each
+                block separately.
+            processes: If given, the number of worker processes among which
+                to split the entries when taking their real parts
+        """
+        if method not in ("auto", "modal", "jordan", "exp"):
+            raise RuntimeError(f"Unknown state transition matrix method {method}")
+        systems = self.__block_systems()
+        if len(systems) > 1:  # Decoupled, so each block is exponentiated alone
+            compute = lambda: self.__phi_blocks(systems, t, method, processes)
+        else:
+            if method != "exp" and any(
+                val.has(sp.CRootOf) for val, _, _ in self.__eigenvects()
+            ):  # Inverting P would not terminate in practice
+                raise RuntimeError(
+                    "The eigenvalues of A are not expressible in radicals, so "
+                    f"the {method} method cannot invert the eigenvector matrix"
+                )
+            if method == "auto":
+                method = "modal" if self.is_diagonalizable() else "jordan"
+            if method == "modal":
+                compute = lambda: self.__phi_modal(t, processes)
+            elif method == "jordan":
+                compute = lambda: self.__phi_jordan(t, processes)
+            else:
+                compute = lambda: sp.exp(self.A * t)  # Works for repeated roots, too
+        Phi = self.__cached(
+            ("Phi", t, method),
+            lambda: disk_cached(
+                "Phi", (self.A.as_immutable(), t, method),
+                lambda: compute().as_immutable(),
+            ),
+        )
+        return Phi.as_mutable()
+
+    def __phi_blocks(self, systems, t, method, processes):
+        """Returns the state transition matrix assembled from each decoupled block's"""
+        n = self.A.shape[0]
+        Phi = self.A.zeros(n, n)
+        for idx, system in systems:
+            Phi_k = system.state_transition_matrix(
+                t, method=method, processes=processes
+            )
+            for row, i in enumerate(idx):
+                for col, j in enumerate(idx):
+                    Phi[i, j] = Phi_k[row, col]
+        return Phi
+
+    def __phi_real(self, Phi, t, processes):
+        """Returns Phi with real entries if A and t are real, as SymPy's exp does"""
+        if t.is_real and all(a.is_real for a in self.A):
+            return applyfunc(Phi, sp.re, processes)
+        return Phi
+
+    def __phi_modal(self, t, processes):
+        """Returns the state transition matrix from the eigen-decomposition of A"""
+        P, L = self.diag_transformation(sort=False)
+        eLt = sp.diag(*[sp.exp(L[i, i] * t) for i in range(L.rows)])
+        return self.__phi_real(P * eLt * P.inv(), t, processes)
+
+    def __phi_jordan(self, t, processes):
+        """Returns the state transition matrix from the Jordan form of A"""
+        P, J = self.jordan_form()
+        eJt = sp.zeros(*J.shape)
+        i = 0
+        while i < J.rows:  # Each Jordan block J_k = l*I + N has exp(J_k*t) = exp(l*t)*exp(N*t)
+            n = 1
+            while i + n < J.rows and J[i + n - 1, i + n] == 1:
+                n += 1
+            elt = sp.exp(J[i, i] * t)
+            for j in range(n):
+                for k in range(j, n):
+                    eJt[i + j, i + k] = elt * t ** (k - j) / sp.factorial(k - j)
+            i += n
+        return self.__phi_real(P * eJt * P.inv(), t, processes)
 
     def state_free_response(self, t, x0):
         """Returns the free response of the state vector"""
@@ -83,44 +352,288 @@ class StateSpaceSymbolic:
         """Returns the free response of the output vector"""
         return self.C * self.state_free_response(t, x0)
 
-    def state_forced_response(self, t, u):
-        """Returns the forced response of the state vector"""
-        if hasattr(u, "is_symbol"):
+    def resolvent(self, s):
+        """Returns the resolvent matrix (sI - A)^-1
+
+        The resolvent is computed fraction-free as adj(sI - A)/det(sI - A),
+        with the Berkowitz algorithm, and cached for each Laplace variable s 
+        until A changes.
+        """
+        adj, den = self.__cached(("adjugate", s), lambda: self.__adjugate(s))
+        return adj.as_mutable() / den
+
+    def __adjugate(self, s):
+        """Returns adj(sI - A) and det(sI - A) as expanded polynomials in s
+
+        With the characteristic polynomial det(sI - A) = sum of c_k s^(n-k),
+        the adjugate is sum of B_k s^(n-1-k), where B_0 = I and 
+        B_k = A B_(k-1) + c_k I (the Faddeev-LeVerrier recursion, but with
+        the division-free Berkowitz coefficients).
+        """
+        c = self.__charpoly()
+        n = self.A.shape[0]
+        B_k = sp.eye(n)
+        adj = B_k * s**(n - 1)
+        for k in range(1, n):
+            B_k = (self.A * B_k + c[k] * sp.eye(n)).applyfunc(sp.expand)
+            adj += B_k * s**(n - 1 - k)
+        return adj.as_immutable(), self.__charpoly_expr(s)
+
+    def __charpoly(self):
+        """Returns the coefficients [1, c_1, ..., c_n] of det(sI - A), cached
+
+        The coefficients are computed with the Berkowitz algorithm, which
+        needs no division, so they stay polynomial in the parameters.
+        """
+        return self.__cached(
+            "charpoly",
+            lambda: tuple(sp.expand(c) for c in self.A.charpoly().all_coeffs()),
+        )
+
+    def __charpoly_expr(self, s):
+        """Returns det(sI - A) as an expanded polynomial in s"""
+        c = self.__charpoly()
+        n = len(c) - 1
+        return sp.Add(*[c_k * s**(n - k) for k, c_k in enumerate(c)])
+
+    def transfer_matrix(self, s=sp.Symbol("s")):
+        """Returns N(s), d(s): the transfer matrix C (sI - A)^-1 B + D = N(s)/d(s)
+
+        The denominator is the characteristic polynomial d(s) = det(sI - A),
+        computed once with the Berkowitz algorithm, and the numerators are 
+        C adj(sI - A) B + D d(s), built from the Markov parameters C A^i B, 
+        so no matrix is inverted and no n x n adjugate is formed. Both are
+        expanded polynomials in s. Common factors of a numerator and the 
+        denominator (from uncontrollable or unobservable modes) are not 
+        cancelled. The result is cached for each s until A changes.
+
+        Args:
+            s: The Laplace variable (Default: sp.Symbol("s"))
+        """
+        key = (
+            "transfer_matrix", s, self.B.as_immutable(), self.C.as_immutable(),
+            self.D.as_immutable(),
+        )
+        N, den = self.__cached(key, lambda: self.__transfer_matrix(s))
+        return N.as_mutable(), den
+
+    def __transfer_matrix(self, s):
+        """Returns N(s) and d(s) of transfer_matrix"""
+        c = self.__charpoly()
+        n = self.A.shape[0]
+        CA_i = self.C  # C A^i
+        markov = []  # C A^i B, for i = 0, ..., n - 1
+        for i in range(n):
+            markov.append(CA_i * self.B)
+            CA_i = CA_i * self.A
+        den = self.__charpoly_expr(s)
+        N = self.D * den
+        for k in range(n):  # C B_k B = sum of c_j C A^(k-j) B
+            CB_kB = sum((c[j] * markov[k - j] for j in range(k + 1)), sp.zeros(*N.shape))
+            N += CB_kB * s**(n - 1 - k)
+        return N.applyfunc(sp.expand).as_immutable(), den
+
+    def to_tfs(self, s=sp.Symbol("s")):
+        """Returns the transfer function(s) as TransferFunctionSymbolic objects
+
+        The transfer functions share the denominator det(sI - A) (see 
+        transfer_matrix), so its roots and factors are computed once for
+        all channels.
+
+        Args:
+            s: The Laplace variable (Default: sp.Symbol("s"))
+
+        Returns:
+            A TransferFunctionSymbolic for a single-input, single-output 
+            model, else a list (for each output) of lists (for each input) 
+            of them
+        """
+        from .transferfunctionsymbolic import TransferFunctionSymbolic
+
+        N, den = self.transfer_matrix(s)
+        H = [
+            [TransferFunctionSymbolic(N[i, j] / den, s=s) for j in range(N.cols)]
+            for i in range(N.rows)
+        ]
+        if N.shape == (1, 1):
+            return H[0][0]
+        return H
+
+    def state_forced_response(
+            self, t, u, method="convolution", processes=None, 
+            simplify=None, timeout=None, budget=None,
+        ):
+        """Returns the forced response of the state vector
+
+        Args:
+            t: The time symbol
+            u: The input vector (or scalar input) as time-dependent expressions
+            method: How to compute the response, one of
+                - "convolution": Phi(t) * integral of Phi(-tau) * B * u(tau) 
+                  from 0 to t,
+                - "laplace": inverse Laplace transform, by residues, of 
+                  X(s) = (sI - A)^-1 * B * U(s), using the cached 
+                  resolvent. This is much faster.
+                (Default: "convolution")
+            processes: If given, the number of worker processes among which
+                to split the integration and simplification of the entries
+            simplify: The simplification policy for each entry, "none", 
+                "cheap", or "full" (see dysys.simplification.simplify).
+                (Default: "full" for the convolution method, "none" for the 
+                laplace method)
+            timeout: If given, the number of seconds after which to abandon
+                the simplification of an entry, which is then returned 
+                unsimplified. Results simplified with a timeout are not cached.
+            budget: If given, the maximum operation count of an entry to 
+                simplify
+        """
+        if hasattr(u, "is_symbol") or not hasattr(u, "__iter__"):  # Scalar input
             u = sp.Matrix([u])
         else:
             u = sp.Matrix(u)
-        Phi = self.state_transition_matrix(t)
-        tau = sp.Symbol("tau", real=True)
-        x_fo = Phi * sp.integrate(
-            Phi.subs(t, -tau) * self.B * u.subs(t, tau), (tau, 0, t)
+        if method not in ("convolution", "laplace"):
+            raise RuntimeError(f"Unknown forced response method {method}")
+        if simplify is None:
+            simplify = "full" if method == "convolution" else "none"
+        args = (
+            self.A.as_immutable(), self.B.as_immutable(), t, u.as_immutable(), method
+        )
+        x_fo = self.__cached(
+            ("state_forced_response",) + args[1:],
+            lambda: disk_cached(
+                "state_forced_response", args,
+                lambda: self.__state_forced_response(t, u, method, processes).as_immutable(),
+            ),
         )
-        return x_fo.simplify()
+        if simplify != "none":
+            compute = lambda: applyfunc(
+                x_fo,
+                partial(simplify_expr, policy=simplify, timeout=timeout, budget=budget),
+                processes,
+            )
+            if timeout is None:
+                x_fo = self.__cached(
+                    ("state_forced_response",) + args[1:] + (simplify, budget),
+                    lambda: disk_cached(
+                        "state_forced_response_simplified", args + (simplify, budget),
+                        compute,
+                    ),
+                )
+            else:
+                x_fo = compute()
+        return x_fo.as_mutable()
+
+    def __state_forced_response(self, t, u, method, processes):
+        """Returns the unsimplified forced response of the state vector for input u"""
+        if method == "convolution":
+            Phi = self.state_transition_matrix(t, processes=processes)
+            tau = sp.Symbol("tau", real=True)
+            return Phi * applyfunc(
+                Phi.subs(t, -tau) * self.B * u.subs(t, tau),
+                partial(integrate, limits=(tau, 0, t)),
+                processes,
+            )
+        else:
+            s = _s
+            U = u.applyfunc(lambda ui: laplace_transform(ui, t, s))
+            X = self.resolvent(s) * self.B * U
+            return X.applyfunc(lambda Xi: inverse_laplace_transform(Xi, s, t))
 
-    def output_forced_response(self, t, u):
+    def output_forced_response(
+            self, t, u, method="convolution", processes=None,
+            simplify=None, timeout=None, budget=None,
+        ):
         """Returns the forced response of the output vector"""
-        return self.C * self.state_forced_response(t, u)
+        return self.C * self.state_forced_response(
+            t, u, method=method, processes=processes,
+            simplify=simplify, timeout=timeout, budget=budget,
+        )
 
-    def state_response(self, t, x0=None, u=None):
+    def state_response(
+            self, t, x0=None, u=None, method="convolution", processes=None,
+            simplify=None, timeout=None, budget=None,
+        ):
         """Returns the state response for initial condition x0 and input u"""
         if x0 is None and u is None:
             return sp.zeros(self.A.shape[0], 1)
         elif x0 is None:
-            return self.state_forced_response(t, u)
+            return self.state_forced_response(
+                t, u, method=method, processes=processes,
+                simplify=simplify, timeout=timeout, budget=budget,
+            )
         elif u is None:
             return self.state_free_response(t, x0)
         else:
-            return self.state_free_response(t, x0) + self.state_forced_response(t, u)
+            return self.state_free_response(t, x0) + self.state_forced_response(
+                t, u, method=method, processes=processes,
+                simplify=simplify, timeout=timeout, budget=budget,
+            )
 
-    def output_response(self, t, x0=None, u=None):
+    def output_response(
+            self, t, x0=None, u=None, method="convolution", processes=None,
+            simplify=None, timeout=None, budget=None,
+        ):
         """Returns the output response for initial condition x0 and input u"""
         if x0 is None and u is None:
             return sp.zeros(self.C.shape[0], 1)
         elif x0 is None:
-            return self.output_forced_response(t, u)
+            return self.output_forced_response(
+                t, u, method=method, processes=processes,
+                simplify=simplify, timeout=timeout, budget=budget,
+            )
         elif u is None:
             return self.output_free_response(t, x0)
         else:
-            return self.output_free_response(t, x0) + self.output_forced_response(t, u)
+            return self.output_free_response(t, x0) + self.output_forced_response(
+                t, u, method=method, processes=processes,
+                simplify=simplify, timeout=timeout, budget=budget,
+            )
+
+    def numeric(
+            self, t, x0=None, u=None, output=True, params=None, backend="numpy",
+            method="convolution", simplify=None,
+        ):
+        """Returns the output (or state) response compiled to a numerical function
+
+        The response (see output_response and state_response) is compiled 
+        once, with common subexpressions, such as the exponentials of the 
+        modes, eliminated across all entries, and cached for these 
+        arguments until A changes.
+
+        Args:
+            t: The time symbol
+            x0: The initial condition (Default: zero)
+            u: The input (Default: zero)
+            output: If True, compiles the output response; if False, the state
+                response
+            params: Sequence of parameter symbols, in the order their values
+                are given to the returned function. (Default: the free 
+                symbols of the response other than t, sorted by name)
+            backend: "numpy", "numba", or "c" (see codegen.NumericFunction)
+            method, simplify: As for state_forced_response
+
+        Returns:
+            A NumericFunction f, with f(t_values, *param_values) of shape 
+            (p, len(t_values)) for the output, or (n, len(t_values)) for the
+            state
+        """
+        def immutable(v):
+            if v is None or not hasattr(v, "__iter__"):
+                return v
+            return sp.ImmutableMatrix(v)
+        key = (
+            "numeric", t, immutable(x0), immutable(u), output, 
+            None if params is None else tuple(params), backend, method, simplify,
+            self.B.as_immutable(), self.C.as_immutable(), self.D.as_immutable(),
+        )
+        def compute():
+            response = self.output_response if output else self.state_response
+            r = response(t, x0=x0, u=u, method=method, simplify=simplify)
+            args = params
+            if args is None:
+                args = sorted(r.free_symbols - {t}, key=str)
+            return NumericFunction((t, *args), r, backend=backend)
+        return self.__cached(key, compute)
 
     def to_numpy(self, params: dict = {}):
         """Returns A, B, C, D as NumPy arrays"""
@@ -130,8 +643,148 @@ class StateSpaceSymbolic:
         D = np.array(self.D.subs(params)).astype(np.float64)
         return A, B, C, D
 
+    def discretize(self, dt, params: dict = {}):
+        """Returns Ad, Bd, C, D: the zero-order-hold discretization as NumPy arrays
+
+        The result is cached for each step dt and set of parameter values
+        until the model matrices change.
+
+        Args:
+            dt: The time step
+            params: Dict of parameter symbols and their values
+        """
+        key = (
+            "zoh", float(dt), self.B.as_immutable(), self.C.as_immutable(),
+            self.D.as_immutable(), tuple(sorted(params.items(), key=str)),
+        )
+        def compute():
+            A, B, C, D = self.to_numpy(params=params)
+            Ad, Bd = zoh_discretize(A, B, dt)
+            return Ad, Bd, C, D
+        return self.__cached(key, compute)
+
+    def simulate(self, t, x0=None, u=None, params: dict = {}):
+        """Returns x, y: the numerical state and output responses
+
+        The model is discretized once with a zero-order hold on the input 
+        (see discretize), then stepped with NumPy, so no symbolic response 
+        is computed.
+
+        Args:
+            t: Uniformly spaced array of N times
+            x0: The initial state (Default: zero)
+            u: The input sampled at t, of shape (N,) for a single input or 
+                (m, N) (Default: zero)
+            params: Dict of parameter symbols and their values
+
+        Returns:
+            x of shape (n, N) and y of shape (p, N)
+        """
+        t = np.asarray(t, dtype=np.float64)
+        Ad, Bd, C, D = self.discretize(uniform_step(t), params=params)
+        if x0 is None:
+            x0 = np.zeros(Ad.shape[0])
+        x0 = np.asarray(x0, dtype=np.float64).reshape(-1)
+        u = input_array(u, Bd.shape[1], len(t))
+        return simulate_discrete(Ad, Bd, C, D, x0, u)
+
+    def simulate_stream(
+            self, u, dt, x0=None, params: dict = {}, chunk_size=65536, 
+            states=False, out=None,
+        ):
+        """Yields the numerical output response chunk by chunk
+
+        The model is discretized once (see discretize) and the input is 
+        consumed in chunks, carrying the state between them, so memory use
+        does not grow with the horizon (see simulation.simulate_stream).
+
+        Args:
+            u: The input sampled every dt, as an array of shape (N,) or
+                (m, N), such as an np.memmap, or an iterable of chunks
+            dt: The time step
+            x0: The initial state (Default: zero)
+            params: Dict of parameter symbols and their values
+            chunk_size: The length of the chunks into which an input array is 
+                split
+            states: If True, yields (x, y) chunks instead of y chunks
+            out: If given, an array (e.g., an np.memmap) of shape (p, N) into
+                which the output is also written
+
+        Yields:
+            y chunks of shape (p, L), or (x, y) chunks with x of shape (n, L)
+        """
+        Ad, Bd, C, D = self.discretize(dt, params=params)
+        if x0 is None:
+            x0 = np.zeros(Ad.shape[0])
+        return simulate_stream(
+            Ad, Bd, C, D, x0, u, chunk_size=chunk_size, states=states, out=out
+        )
+
+    def to_numpy_batch(self, values, params=None):
+        """Returns A, B, C, D as stacked NumPy arrays for N parameter sets
+
+        The matrix entries are lambdified once per parameter tuple and 
+        cached, then evaluated for all N parameter sets in one call.
+
+        Args:
+            values: Parameter values, given as a dict of arrays, a 
+                structured array, or an array of shape (N, len(params))
+            params: Sequence of parameter symbols, in the order their values
+                are given (Default: the free symbols of the model, sorted by
+                name)
+
+        Returns:
+            A, B, C, D of shapes (N, n, n), (N, n, m), (N, p, n), (N, p, m)
+        """
+        matrices = (self.A, self.B, self.C, self.D)
+        if params is None:
+            params = sorted(
+                set().union(*(M.free_symbols for M in matrices)), key=str
+            )
+        params = tuple(params)
+        key = ("batch",) + tuple(M.as_immutable() for M in matrices[1:]) + (params,)
+        f = self.__cached(
+            key, lambda: CoefficientEvaluator([list(M) for M in matrices], params)
+        )
+        return tuple(
+            a.reshape((-1,) + M.shape) for a, M in zip(f(values), matrices)
+        )
+
+    def simulate_many(
+            self, t, values, x0=None, u=None, params=None, processes=None
+        ):
+        """Returns x, y: numerical responses for N parameter sets at once
+
+        The N models are evaluated with to_numpy_batch, discretized with a 
+        single stacked matrix exponential, and stepped together.
+
+        Args:
+            t: Uniformly spaced array of T times
+            values: Parameter values (see to_numpy_batch)
+            x0: The initial state, of shape (n,) or (N, n) (Default: zero)
+            u: The input sampled at t, of shape (T,), (m, T), or (N, m, T) 
+                (Default: zero)
+            params: Sequence of parameter symbols (see to_numpy_batch)
+            processes: If given, the number of worker processes among which
+                to split the N systems
+
+        Returns:
+            x of shape (N, n, T) and y of shape (N, p, T)
+        """
+        t = np.asarray(t, dtype=np.float64)
+        A, B, C, D = self.to_numpy_batch(values, params=params)
+        Ad, Bd = zoh_discretize(A, B, uniform_step(t))
+        if x0 is None:
+            x0 = np.zeros(A.shape[1])
+        x0 = np.asarray(x0, dtype=np.float64)
+        if u is None or np.ndim(u) < 3:
+            u = input_array(u, B.shape[2], len(t))
+        return simulate_batch(Ad, Bd, C, D, x0, np.asarray(u), processes=processes)
+
     def to_control(self, params: dict = {}):
         """Returns an equivalent Control Systems package control.StateSpace object"""
+        import control  # Deferred, as python-control is slow to import
+
         A, B, C, D = self.to_numpy(params=params)
         return control.ss(A, B, C, D)
 
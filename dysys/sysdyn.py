@@ -1,45 +1,147 @@
 import numpy as np
 import sympy as sp
-import matplotlib.pyplot as plt
 import control
+from .modal import (
+    Stability, classify_stability, stability_many, stability_from_eigenvalues, 
+    eigvals_many, natural_frequencies, damping_ratios, time_constants,
+)
+from .roots import limit_denominator
+from .simulation import simulate_stream, zoh_discretize
 
 
-def eigenvalue_matrix_np2sp(eval_list):
+def _rationals_np2sp(values, max_denominator):
+    """Returns a list of SymPy numbers snapped from the complex array values"""
+    values = np.asarray(values, dtype=np.complex128).ravel()
+    p_re, q_re = limit_denominator(values.real, max_denominator)
+    p_im, q_im = limit_denominator(values.imag, max_denominator)
+    numbers = {}  # Each distinct value is converted to SymPy once
+    result = []
+    for key in zip(p_re.tolist(), q_re.tolist(), p_im.tolist(), q_im.tolist()):
+        if key not in numbers:
+            numbers[key] = sp.Rational(key[0], key[1]) + sp.I * sp.Rational(key[2], key[3])
+        result.append(numbers[key])
+    return result
+
+
+def eigenvalue_matrix_np2sp(eval_list, max_denominator=None):
     """Returns the symbolic eigenvalue matrix from a list
     of eigenvalues from numpy
+
+    Args:
+        eval_list: The eigenvalues
+        max_denominator: If given, the real and imaginary parts are snapped to
+            the closest rationals with denominators no greater than this, in
+            a single vectorized pass, instead of using sp.nsimplify
     """
-    return sp.diag(  # Diagonal matrix constructor
-        *list(sp.Matrix(eval_list))  # Comma-separated expressions
-    ).applyfunc(
-        sp.nsimplify
-    )  # Uses symbolic numbers
+    if max_denominator is None:
+        evals = [sp.nsimplify(e) for e in sp.Matrix(eval_list)]  # Symbolic numbers
+    else:
+        evals = _rationals_np2sp(eval_list, max_denominator)
+    return sp.diag(*evals)  # Only the diagonal is converted
 
 
-def modal_matrix_np2sp(evec_array):
+def modal_matrix_np2sp(evec_array, max_denominator=None):
     """Returns the symbolic modal matrix from a numpy array
     of eigenvectors
+
+    Args:
+        evec_array: The eigenvectors as columns
+        max_denominator: If given, the real and imaginary parts are snapped to
+            the closest rationals with denominators no greater than this, in
+            a single vectorized pass, instead of using sp.nsimplify
     """
-    return sp.Matrix(evec_array).applyfunc(sp.nsimplify)  # Uses symbolic numbers
-
-
-def stability_from_eigenvalues(eval_list):
-    """Returns the stability as str of from a list of eigenvalues"""
-    real_parts = np.real(eval_list)
-    n_zero = 0  # Number of zero real parts
-    for l in real_parts:
-        if l > 0:
-            return "unstable"
-        elif l == 0:
-            n_zero += 1
-    if n_zero > 0:
-        return "marginally stable"
-    else:
-        return "stable"
+    if max_denominator is None:
+        return sp.Matrix(evec_array).applyfunc(sp.nsimplify)  # Uses symbolic numbers
+    evec_array = np.atleast_2d(evec_array)
+    return sp.Matrix(*evec_array.shape, _rationals_np2sp(evec_array, max_denominator))
 
 
 class StateSpace(control.StateSpace):
-    """Subclass of control.StateSpace with extra methods"""
+    """Subclass of control.StateSpace with extra methods
+
+    The eigendecomposition of A is computed once and cached, and recomputed
+    only when A changes (by reassignment or in place). So is the 
+    discretization used by simulate_stream.
+    """
+
+    def __eig(self):
+        A = np.asarray(self.A)
+        cached = getattr(self, "_StateSpace__eig_cache", None)
+        if cached is None or not np.array_equal(cached[0], A):
+            self.__eig_cache = (A.copy(), np.linalg.eig(A))
+        return self.__eig_cache[1]
 
     def eig(self):
         """Returns the eigenvalues and eigenvectors of the A matrix"""
-        return np.linalg.eig(self.A)
+        evals, evecs = self.__eig()
+        return evals.copy(), evecs.copy()
+
+    def eigvals(self):
+        """Returns the eigenvalues of the A matrix"""
+        return self.__eig()[0].copy()
+
+    def stability(self, tol=0.0):
+        """Returns the stability as str from the eigenvalues of A"""
+        return stability_from_eigenvalues(self.__eig()[0], tol=tol)
+
+    def natural_frequencies(self):
+        """Returns the natural frequency of each eigenvalue of A"""
+        return natural_frequencies(self.__eig()[0])
+
+    def damping_ratios(self):
+        """Returns the damping ratio of each eigenvalue of A"""
+        return damping_ratios(self.__eig()[0])
+
+    def time_constants(self):
+        """Returns the time constant of each eigenvalue of A"""
+        return time_constants(self.__eig()[0])
+
+    def __discrete(self, dt):
+        """Returns the cached Ad, Bd: A and B, discretized with step dt if continuous"""
+        A, B = np.asarray(self.A), np.asarray(self.B)
+        if self.isdtime(strict=True):
+            if dt is not None and self.dt is not True and dt != self.dt:
+                raise RuntimeError(
+                    f"Time step {dt} differs from the system's time step {self.dt}"
+                )
+            return A, B
+        if dt is None:
+            raise RuntimeError("A time step dt is required for a continuous-time system")
+        cached = getattr(self, "_StateSpace__discrete_cache", None)
+        if (
+            cached is None or cached[0] != dt 
+            or not np.array_equal(cached[1], A) or not np.array_equal(cached[2], B)
+        ):
+            self.__discrete_cache = (dt, A.copy(), B.copy(), zoh_discretize(A, B, dt))
+        return self.__discrete_cache[3]
+
+    def simulate_stream(
+            self, u, dt=None, x0=None, chunk_size=65536, states=False, out=None
+        ):
+        """Yields the output response chunk by chunk, with bounded memory
+
+        Continuous-time systems are discretized with a zero-order hold on 
+        the input, once for each dt (see simulation.simulate_stream).
+
+        Args:
+            u: The input, as an array of shape (N,) or (m, N), such as an
+                np.memmap, or an iterable of chunks
+            dt: The time step (required for continuous-time systems; if 
+                given for a discrete-time system, must equal its own)
+            x0: The initial state (Default: zero)
+            chunk_size: The length of the chunks into which an input array is 
+                split
+            states: If True, yields (x, y) chunks instead of y chunks
+            out: If given, an array (e.g., an np.memmap) of shape (p, N) into
+                which the output is also written
+
+        Yields:
+            y chunks of shape (p, L), or (x, y) chunks with x of shape (n, L)
+        """
+        Ad, Bd = self.__discrete(dt)
+        if x0 is None:
+            x0 = np.zeros(Ad.shape[0])
+        return simulate_stream(
+            Ad, Bd, np.asarray(self.C), np.asarray(self.D), x0, u,
+            chunk_size=chunk_size, states=states, out=out,
+        )
@@ -1,6 +1,12 @@
 import sympy as sp
 import numpy as np
-import control
+from mpmath.libmp import NoConvergence
+from sympy.polys.polyerrors import UnsolvableFactorError
+from .cache import disk_cached, memoized
+from .codegen import CoefficientEvaluator, NumericFunction, horner
+from .laplace import cluster_roots, laplace_transform, merge_roots, residue_inverse
+from .roots import factors_canonical_from_roots, limit_denominator, poly_roots_many
+from .simplification import cheap_simplify, simplify as simplify_expr
 
 class TransferFunctionSymbolic:
     """Represents a SISO continuous LTI transfer function model in symbolic form"""
@@ -17,10 +23,14 @@ class TransferFunctionSymbolic:
                 if not self.s in H.free_symbols:
                     if len(H.free_symbols) > 0:
                         raise(RuntimeError(f"Symbol {self.s} not in H"))
-        num, den = sp.fraction(H)
-        self.num = num.collect(self.s)
-        self.den = den.collect(self.s)
+        self.num, self.den = memoized("fraction", (H, self.s), lambda: tuple(
+            p.collect(self.s) for p in sp.fraction(H)
+        ))
         self.H = self.num/self.den
+        self.__polys = None  # num and den as Poly objects, created on first use
+        self.__compiled = {}  # Coefficient evaluators keyed by parameters
+        self.__responses = {}  # Forced responses keyed by (t, U, method, ...)
+        self.__numeric = {}  # Compiled responses keyed by their arguments
         
     def __call__(self, s):
         """Evaluate the transfer function at a complex frequency s"""
@@ -29,8 +39,31 @@ class TransferFunctionSymbolic:
     def __str__(self):
         return sp.pretty(self.H)
     
+    def __num_den_polys(self):
+        """Returns num and den as Poly objects in s
+
+        The coefficient domain is inferred by SymPy, e.g., QQ for numeric
+        coefficients or ZZ[a, b] for polynomial parameters. The Poly objects
+        are created once and shared by all transfer functions with the same
+        num and den. Either is None if it is not a polynomial in s, e.g., 
+        for a time delay exp(-s).
+        """
+        if self.__polys is None:
+            self.__polys = memoized(
+                "polys", (self.num, self.den, self.s),
+                lambda: (self.num.as_poly(self.s), self.den.as_poly(self.s)),
+            )
+        return self.__polys
+
     def __factor_p(self, p, poles=True):
-        p = sp.Poly(p, self.s).factor_list()  # Factored
+        K, factors = memoized(
+            "factor_p", (p, self.s, poles),
+            lambda: self.__factor_p_uncached(p, poles=poles),
+        )
+        return K, list(factors)
+
+    def __factor_p_uncached(self, p, poles=True):
+        p = p.factor_list()  # Factored
         if poles:
             K = 1/p[0]  # Overall gain
         else:
@@ -38,8 +71,8 @@ class TransferFunctionSymbolic:
         factors = []
         for pi in p[1]:  # Each factor
             m = pi[1]  # Multiplicity
-            d = sp.Poly(pi[0], self.s).degree()
-            cs_k = sp.Poly(pi[0], self.s).all_coeffs()
+            d = pi[0].degree()
+            cs_k = pi[0].all_coeffs()
             if d == 2:
                 k = cs_k[0]  # factor gain
                 cs = list(map(lambda c: c/k, cs_k))
@@ -71,50 +104,216 @@ class TransferFunctionSymbolic:
             for _ in range(0, m):
                 K = k*K
                 factors.append(factor)
-        return K, factors
+        return K, tuple(factors)
         
+    def __coeffs(self):
+        """Returns num and den coefficients as lists of expressions"""
+        num, den = self.__polynomial(0), self.__polynomial(1)
+        return num.all_coeffs(), den.all_coeffs()
+
     def __num_den_lists(self, params: dict = {}):
         """Returns num and den coefficients as lists"""
-        num, den = self.num, self.den
-        num = np.array(sp.Poly(num.evalf(subs=params), self.s).all_coeffs())
-        den = np.array(sp.Poly(den.evalf(subs=params), self.s).all_coeffs())
-        num = num.astype(float)
-        den = den.astype(float)
+        num, den = self.compile(tuple(params.keys()))(params)
+        num = np.trim_zeros(num[0], "f")  # Parameters may zero leading coef's
+        den = np.trim_zeros(den[0], "f")
+        if len(num) == 0:
+            num = np.zeros(1)
         return num, den
 
+    def compile(self, params=None):
+        """Returns a function that evaluates num and den coefficients in batches
+
+        The coefficient expressions are lambdified once per parameter tuple
+        and cached, so parameter sweeps avoid SymPy substitution.
+
+        Args:
+            params: Sequence of parameter symbols, in the order their values
+                are given to the returned function. (Default: the free 
+                symbols of H other than s, sorted by name)
+
+        Returns:
+            A function of parameter values (a dict of arrays, a structured 
+            array, or an array of shape (N, len(params))) that returns the 
+            num and den coefficient arrays with shapes (N, n_num) and 
+            (N, n_den), highest power first
+        """
+        if params is None:
+            params = sorted(self.H.free_symbols - {self.s}, key=str)
+        params = tuple(params)
+        if params not in self.__compiled:
+            self.__compiled[params] = CoefficientEvaluator(self.__coeffs(), params)
+        return self.__compiled[params]
+
     def to_control(self, params: dict = {}):
         """Returns an equivalent Control Systems package control.TransferFunction object"""
+        import control  # Deferred, as python-control is slow to import
+
         num, den = self.__num_den_lists(params=params)
         return control.tf(num, den)
 
-    def factor(self, check=False):
-        """Returns an overall gain and a list of standard-form terms"""
-        num, den = sp.fraction(self.H.cancel())
-        Kz, factors_z = self.__factor_p(num, poles=False)
-        Kp, factors_p = self.__factor_p(den, poles=True)
-        K = Kz * Kp
-        factors = factors_p + factors_z
+    def factor(self, check=False, numeric=None, max_denominator=None):
+        """Returns an overall gain and a list of standard-form terms
+
+        Args:
+            check: If True, checks that the terms multiply to H
+            numeric: If True, finds the terms from numerical roots (see
+                poles); if False, factors symbolically. (Default: numerical 
+                if H has floating-point coefficients and no parameters)
+            max_denominator: If given, the numerical gain and term 
+                coefficients are snapped to the closest rationals with 
+                denominators no greater than this
+        """
+        if self.__use_numeric(numeric):
+            K, factors = self.__factor_numeric(max_denominator)
+        else:
+            K, factors = disk_cached("factor", (self.H, self.s), self.__factor)
         if check:
             # Check that the factors are correct
             H = K
             for f in factors:
                 H *= f
             H = H.expand(numer=True).expand(denom=True)
-            if not H.equals(self.H):
+            if self.__use_numeric(numeric):
+                ok = self.__equals_numeric(H)
+            else:
+                ok = H.equals(self.H)
+            if not ok:
                 raise(RuntimeError(f"Factors do not multiply to {self.H} but {H}"))
         return K, factors
     
-    def poles(self):
-        """Returns a dict of the symbolic poles as keys and multiplicity as values"""
-        return sp.roots(self.den.as_poly(self.s), strict=True)
+    def __factor(self):
+        """Returns the overall gain and standard-form terms of factor()"""
+        num, den = self.__polynomial(0), self.__polynomial(1)
+        num, den = num.cancel(den, include=True)  # Polynomial GCD, no Expr rebuild
+        Kz, factors_z = self.__factor_p(num, poles=False)
+        Kp, factors_p = self.__factor_p(den, poles=True)
+        return Kz * Kp, factors_p + factors_z
+
+    def __use_numeric(self, numeric):
+        """Returns whether to use the numerical path for factor, poles, and zeros"""
+        polys = self.__num_den_polys()
+        real = all(p is not None and (p.domain.is_ZZ or p.domain.is_QQ or p.domain.is_RR) for p in polys)
+        if numeric is None:
+            return real and any(p.domain.is_RR for p in polys)
+        if numeric and not real:
+            raise(RuntimeError("Numerical path requires real numeric coefficients"))
+        return numeric
+
+    def __factor_numeric(self, max_denominator):
+        """Returns the gain and standard-form terms of factor() from numerical roots
+
+        Roots at the origin become s terms, the other real roots (tau*s + 1) 
+        terms, and conjugate pairs (s**2 + 2*zeta*wn*s + wn**2)/wn**2 terms.
+        Common roots of num and den are not cancelled.
+        """
+        coeffs = [
+            np.array(p.all_coeffs(), dtype=np.float64) for p in self.__num_den_polys()
+        ]
+        n_origin = [len(c) - len(np.trim_zeros(c, "b")) for c in coeffs]
+        coeffs = [np.trim_zeros(c, "b") for c in coeffs]
+        roots = poly_roots_many(coeffs)
+        K = 1
+        terms = []
+        for c, r, m, poles in zip(coeffs, roots, n_origin, (False, True)):
+            canonical = factors_canonical_from_roots(r, c[0])
+            k = _sympy_numbers([canonical[0][0]], max_denominator)[0]
+            K = K / k if poles else K * k
+            factors = [self.s**-1 if poles else self.s] * m
+            for gain, f in canonical[1:]:
+                f = _sympy_numbers(f, max_denominator)
+                if len(f) == 2:  # tau*s + 1
+                    lin = f[0] * self.s + 1
+                    factors.append(1 / lin if poles else lin)
+                else:  # s**2 + 2*zeta*wn*s + wn**2
+                    quad = self.s**2 + f[1] * self.s + f[2]
+                    factors.append(f[2] / quad if poles else quad / f[2])
+            terms = factors + terms  # Poles first, as in the symbolic path
+        return K, terms
+
+    def __equals_numeric(self, H):
+        """Returns whether H has the coefficients of self.H to within rounding"""
+        def normalized(H):
+            num, den = (sp.Poly(p, self.s) for p in sp.fraction(sp.cancel(sp.together(H))))
+            lead = float(den.LC())
+            return [np.array(p.all_coeffs(), dtype=np.float64) / lead for p in (num, den)]
+        num, den = normalized(self.H)
+        num_H, den_H = normalized(H)
+        return (
+            num.shape == num_H.shape and den.shape == den_H.shape
+            and np.allclose(num, num_H, rtol=1e-6, atol=1e-12 * np.abs(num).max())
+            and np.allclose(den, den_H, rtol=1e-6, atol=1e-12 * np.abs(den).max())
+        )
+
+    def __roots_numeric(self, p, max_denominator):
+        """Returns a dict of the roots of Poly p from a companion-matrix eigenvalue solve"""
+        roots = poly_roots_many([np.array(p.all_coeffs(), dtype=np.float64)])[0]
+        roots = np.asarray(roots, dtype=np.complex128)
+        re = _sympy_numbers(roots.real, max_denominator)
+        im = _sympy_numbers(roots.imag, max_denominator)
+        result = {}
+        for a, b in zip(re, im):
+            root = a if b == 0 else a + sp.I * b
+            result[root] = result.get(root, 0) + 1  # Equal after snapping
+        return result
+
+    def poles(self, numeric=None, max_denominator=None):
+        """Returns a dict of the symbolic poles as keys and multiplicity as values
+
+        Args:
+            numeric: If True, finds the poles as the eigenvalues of the 
+                companion matrix of the denominator; if False, symbolically. 
+                (Default: numerical if H has floating-point coefficients and
+                no parameters)
+            max_denominator: If given, the real and imaginary parts of 
+                numerical poles are snapped to the closest rationals with 
+                denominators no greater than this, which merges repeated 
+                poles
+        """
+        if self.__use_numeric(numeric):
+            return self.__roots_numeric(self.__num_den_polys()[1], max_denominator)
+        return dict(memoized("roots", (self.den, self.s), lambda: disk_cached(
+            "roots", (self.den, self.s),
+            lambda: sp.roots(self.__polynomial(1), strict=True),
+        )))
     
-    def zeros(self):
-        """Returns a dict of the symbolic zeros as keys and multiplicity as values"""
-        return sp.roots(self.num.as_poly(self.s), strict=True)
+    def zeros(self, numeric=None, max_denominator=None):
+        """Returns a dict of the symbolic zeros as keys and multiplicity as values
+
+        Args:
+            numeric, max_denominator: As for poles
+        """
+        if self.__use_numeric(numeric):
+            return self.__roots_numeric(self.__num_den_polys()[0], max_denominator)
+        return dict(memoized("roots", (self.num, self.s), lambda: disk_cached(
+            "roots", (self.num, self.s),
+            lambda: sp.roots(self.__polynomial(0), strict=True),
+        )))
     
-    def dc_gain(self):
-        """Returns the DC gain of the transfer function"""
-        return self.__call__(0).simplify()
+    def __polynomial(self, i):
+        """Returns num (i = 0) or den (i = 1) as a Poly, raising if it is not one"""
+        p = self.__num_den_polys()[i]
+        if p is None:
+            p = (self.num, self.den)[i]
+            raise(RuntimeError(f"{p} is not a polynomial in {self.s}"))
+        return p
+
+    def dc_gain(self, simplify="cheap", timeout=None, budget=None):
+        """Returns the DC gain num(0)/den(0) of the transfer function
+
+        Args:
+            simplify, timeout, budget: The simplification policy and its
+                bounds (see dysys.simplification.simplify). (Default: 
+                "cheap", which cancels common parameter factors)
+        """
+        num, den = self.__num_den_polys()
+        if num is None or den is None:
+            gain = self.H.subs(self.s, 0)
+        else:
+            num, den = num.coeff_monomial(1), den.coeff_monomial(1)  # Constant terms
+            if den.is_zero:
+                return sp.nan if num.is_zero else sp.zoo
+            gain = num / den
+        return simplify_expr(gain, simplify, timeout=timeout, budget=budget)
     
     def frequency_response_function(self, w: sp.Symbol = sp.symbols("w", real=True)):
         """Returns the symbolic frequency response function (FRF)
@@ -127,17 +326,42 @@ class TransferFunctionSymbolic:
         """
         return self.__call__(1j * w)
     
+    def frequency_response(self, w, values=None, params=None):
+        """Returns the complex frequency response H(jw) for batches of parameters
+
+        The compiled num and den coefficients (see compile) are evaluated 
+        once per parameter set and the polynomials are evaluated at all 
+        frequencies with Horner's method.
+
+        Args:
+            w: Array of angular frequencies
+            values: Parameter values for compile(params); may be omitted if 
+                H has no parameters
+            params: Sequence of parameter symbols (see compile)
+
+        Returns:
+            Complex array of shape (N, len(w)) for N parameter sets
+        """
+        jw = 1j * np.asarray(w, dtype=np.float64).reshape(-1)
+        num, den = self.compile(params)(values)
+        return horner(num, jw) / horner(den, jw)
+
     def forced_response(
             self, 
             t: sp.Symbol, 
             u: sp.Expr = None, 
             U: sp.Expr = None,
             laplace: bool = False,
+            method: str = "sympy",
+            simplify: str = None,
+            timeout: float = None,
+            budget: int = None,
         ):
         """Returns the forced response of a SISO system
         
         The inverse Laplace transform is used to compute the forced response.
-        Exactly one of arguments u or U may be provided.
+        Exactly one of arguments u or U may be provided. Results are memoized
+        for each time symbol, input, and simplification policy.
         
         Args:
             t: The time symbol
@@ -145,20 +369,133 @@ class TransferFunctionSymbolic:
             U: The input as a Laplace transform (must use 
                 symbolic sp.symbols("s") if using this option)
             laplace: If True, returns Laplace transform Y(s) of the output
+            method: How to invert Y(s), one of
+                - "residues": sum the residues at the poles of H (from 
+                  poles()) and of U(s), without partial fractions,
+                - "sympy": sp.inverse_laplace_transform.
+                The residues method falls back to SymPy if H(s) or U(s) is 
+                not rational or its poles cannot be found. Its parametric 
+                results may not be real for all parameter values. 
+                (Default: "sympy")
+            simplify: The simplification policy for the result, "none", 
+                "cheap", or "full" (see dysys.simplification.simplify).
+                (Default: "none" for responses found by residues, whose 
+                terms are already in simple form, else "full")
+            timeout: If given, the number of seconds after which to abandon
+                the simplification and return the result unsimplified.
+                Results simplified with a timeout are not memoized.
+            budget: If given, the maximum operation count of a result to 
+                simplify
         """
         if (u is None) and (U is None):
             raise(Exception("Must provide input as u(t) or U(s)"))
         elif (u is not None) and (U is not None):
             raise(Exception("Must provide input as just one of u(t) or U(s), not both"))
         if u is not None:
-            U = sp.laplace_transform(u, t, self.s, noconds=True)
-        Y = (self.H * U).simplify()
+            U = laplace_transform(u, t, self.s)
         if laplace:
-            return Y
-        else:
-            y = sp.inverse_laplace_transform(Y, self.s, t, noconds=True)
-            return y.simplify()
+            return simplify_expr(
+                self.H * U, simplify or "full", timeout=timeout, budget=budget
+            )
+        if method not in ("residues", "sympy"):
+            raise(RuntimeError(f"Unknown forced response method {method}"))
+        key = (t, U, method)
+        if key not in self.__responses:
+            self.__responses[key] = disk_cached(
+                "forced_response", (self.H, self.s) + key,
+                lambda: self.__forced_response(t, U, method),
+            )
+        y, by_residues = self.__responses[key]
+        if simplify is None:
+            simplify = "none" if by_residues else "full"
+        if simplify == "none":
+            return y
+        compute = lambda: simplify_expr(y, simplify, timeout=timeout, budget=budget)
+        if timeout is not None:
+            return compute()
+        key = key + (simplify, budget)
+        if key not in self.__responses:
+            self.__responses[key] = disk_cached(
+                "forced_response_simplified", (self.H, self.s) + key, compute
+            )
+        return self.__responses[key]
+
+    def numeric(
+            self, t, u=None, U=None, params=None, backend="numpy", 
+            method="sympy", simplify=None,
+        ):
+        """Returns the forced response compiled to a numerical function
+
+        The response (see forced_response) is compiled once, with common
+        subexpressions eliminated, and cached for these arguments.
+
+        Args:
+            t: The time symbol
+            u, U: The input (see forced_response)
+            params: Sequence of parameter symbols, in the order their values
+                are given to the returned function. (Default: the free 
+                symbols of the response other than t, sorted by name)
+            backend: "numpy", "numba", or "c" (see codegen.NumericFunction)
+            method, simplify: As for forced_response
+
+        Returns:
+            A NumericFunction f, with f(t_values, *param_values) the 
+            response at times t_values
+        """
+        if u is not None:
+            U = laplace_transform(u, t, self.s)
+        key = (t, U, None if params is None else tuple(params), backend, method, simplify)
+        if key not in self.__numeric:
+            y = self.forced_response(t, U=U, method=method, simplify=simplify)
+            if params is None:
+                params = sorted(y.free_symbols - {t}, key=str)
+            self.__numeric[key] = NumericFunction((t, *params), y, backend=backend)
+        return self.__numeric[key]
+
+    def __forced_response(self, t, U, method):
+        """Returns y, by_residues: the unsimplified forced response for input U(s)
         
+        by_residues is True if y was found by residues.
+        """
+        if method == "residues":
+            y = self.__residue_response(t, U)
+            if y is not None:
+                return y, True
+        Y = cheap_simplify(self.H * U)
+        return sp.inverse_laplace_transform(Y, self.s, t, noconds=True), False
+
+    def __residue_response(self, t, U):
+        """Returns the inverse Laplace transform of H(s)U(s) by residues
+        
+        Returns None if H(s) or U(s) is not rational or the poles cannot be 
+        found. Numerical poles that are nearly equal are merged into a 
+        repeated pole (see laplace.cluster_roots).
+        """
+        U = sp.sympify(U)
+        if not (
+            self.H.is_rational_function(self.s) 
+            and U.is_rational_function(self.s)
+        ):
+            return None
+        U_num, U_den = sp.fraction(sp.cancel(U))
+        U_den = sp.Poly(U_den, self.s)
+        try:
+            roots = merge_roots(self.poles(), sp.roots(U_den, strict=True))
+        except (UnsolvableFactorError, NoConvergence):
+            return None
+        roots = cluster_roots(roots)  # Numerically split repeated poles
+        gain = self.__num_den_polys()[1].LC() * U_den.LC()
+        return residue_inverse(self.num * U_num, roots, self.s, t, gain=gain)
+        
+
+def _sympy_numbers(values, max_denominator=None):
+    """Returns a list of SymPy Floats, or Rationals if max_denominator is given"""
+    values = np.asarray(values, dtype=np.float64)
+    if max_denominator is None:
+        return [sp.Float(v) for v in values]
+    p, q = limit_denominator(values, max_denominator)
+    return [sp.Rational(pi, qi) for pi, qi in zip(p.tolist(), q.tolist())]
+
 
 def tfs(H, s=None):
     """Create a TransferFunctionSymbolic object"""
@@ -0,0 +1,120 @@
+import os
+import sympy as sp
+import pytest
+
+from dysys.cache import (
+    DiskCache,
+    enable_disk_cache,
+    disable_disk_cache,
+    disk_cached,
+    MemoCache,
+    MemoInfo,
+    memo_info,
+    memo_clear,
+)
+from dysys.transferfunctionsymbolic import tfs
+from dysys.statespacesymbolic import sss
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    dc = enable_disk_cache(tmp_path)
+    yield dc
+    disable_disk_cache()
+
+
+class TestDiskCache:
+    def test_roundtrip(self, tmp_path):
+        dc = DiskCache(tmp_path)
+        s = sp.Symbol("s")
+        key = dc.key("roots", (s + 1, s))
+        assert dc.get(key) == (False, None)
+        dc.set(key, {-1: 1})
+        assert dc.get(key) == (True, {-1: 1})
+
+    def test_key_depends_on_assumptions(self, tmp_path):
+        dc = DiskCache(tmp_path)
+        t1 = sp.Symbol("t")
+        t2 = sp.Symbol("t", positive=True)
+        assert dc.key("Phi", (t1,)) != dc.key("Phi", (t2,))
+
+    def test_lru_eviction(self, tmp_path):
+        dc = DiskCache(tmp_path, max_bytes=10**9)
+        keys = [dc.key("x", (i,)) for i in range(3)]
+        for i, k in enumerate(keys):
+            dc.set(k, "x" * 1000)
+            os.utime(os.path.join(dc.directory, k + ".pkl"), (i, i))
+        dc.get(keys[0])  # Most recently used now
+        dc.max_bytes = 2500
+        dc.evict()
+        assert dc.get(keys[0])[0]
+        assert not dc.get(keys[1])[0]
+        assert dc.get(keys[2])[0]
+
+    def test_no_temporary_files_left(self, tmp_path):
+        dc = DiskCache(tmp_path)
+        dc.set(dc.key("x", (1,)), 1)
+        assert all(not f.endswith(".tmp") for f in os.listdir(tmp_path))
+
+
+class TestDiskCached:
+    def test_disabled_computes(self):
+        disable_disk_cache()
+        calls = []
+        assert disk_cached("x", (1,), lambda: calls.append(1) or 2) == 2
+        assert disk_cached("x", (1,), lambda: calls.append(1) or 2) == 2
+        assert len(calls) == 2
+
+    def test_enabled_reuses(self, disk_cache):
+        calls = []
+        assert disk_cached("x", (1,), lambda: calls.append(1) or 2) == 2
+        assert disk_cached("x", (1,), lambda: calls.append(1) or 2) == 2
+        assert len(calls) == 1
+
+    def test_symbolic_results_persist(self, disk_cache):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s**2 + 3 * s + 2), s=s)
+        poles = H.poles()
+        y = H.forced_response(t, U=1 / s)
+        K, factors = H.factor()
+        assert len(os.listdir(disk_cache.directory)) >= 3
+        H2 = tfs(1 / (s**2 + 3 * s + 2), s=s)  # New instance, same H
+        assert H2.poles() == poles
+        assert H2.forced_response(t, U=1 / s) == y
+        assert H2.factor() == (K, factors)
+
+    def test_state_space_results_persist(self, disk_cache):
+        t = sp.Symbol("t", positive=True)
+        sys = sss([[-1, 0], [0, -2]], [[1], [1]], [[1, 0]], [[0]])
+        Phi = sys.state_transition_matrix(t)
+        x = sys.state_forced_response(t, 1, method="laplace")
+        n_files = len(os.listdir(disk_cache.directory))
+        sys2 = sss([[-1, 0], [0, -2]], [[1], [1]], [[1, 0]], [[0]])
+        assert sys2.state_transition_matrix(t) == Phi
+        assert sys2.state_forced_response(t, 1, method="laplace") == x
+        assert len(os.listdir(disk_cache.directory)) == n_files
+
+
+class TestMemoCache:
+    def test_lru_and_stats(self):
+        memo = MemoCache(maxsize=2)
+        memo.get_or_compute(("a",), lambda: 1)
+        memo.get_or_compute(("b",), lambda: 2)
+        assert memo.get_or_compute(("a",), lambda: 0) == 1  # Hit; "b" now LRU
+        memo.get_or_compute(("c",), lambda: 3)  # Evicts "b"
+        assert memo.get_or_compute(("b",), lambda: 4) == 4
+        assert memo.info() == MemoInfo(hits=1, misses=4, maxsize=2, currsize=2)
+        memo.clear()
+        assert memo.info() == MemoInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+    def test_shared_across_tfs_instances(self):
+        memo_clear()
+        s = sp.Symbol("s")
+        tfs((s + 1) / (s**2 + 3 * s + 2), s=s).factor()
+        misses = memo_info().misses
+        H = tfs((s + 1) / (s**2 + 3 * s + 2), s=s)  # Structurally identical
+        H.factor()
+        info = memo_info()
+        assert info.misses == misses
+        assert info.hits >= 3  # fraction and both factor_p calls
@@ -0,0 +1,112 @@
+import shutil
+
+import sympy as sp
+import numpy as np
+import pytest
+
+from dysys.codegen import param_columns, CoefficientEvaluator, NumericFunction, horner
+
+
+class TestParamColumns:
+    def test_array(self):
+        a, b = sp.symbols("a b")
+        columns, N = param_columns([a, b], [[1, 2], [3, 4], [5, 6]])
+        assert N == 3
+        np.testing.assert_array_equal(columns[1], [2, 4, 6])
+
+    def test_single_set(self):
+        a, b = sp.symbols("a b")
+        columns, N = param_columns([a, b], [1, 2])
+        assert N == 1
+
+    def test_dict_broadcasts_scalars(self):
+        a, b = sp.symbols("a b")
+        columns, N = param_columns([a, b], {"a": [1, 2, 3], b: 7})
+        assert N == 3
+        np.testing.assert_array_equal(columns[1], [7, 7, 7])
+
+    def test_structured_array(self):
+        a, b = sp.symbols("a b")
+        values = np.array([(1.0, 2.0), (3.0, 4.0)], dtype=[("a", float), ("b", float)])
+        columns, N = param_columns([a, b], values)
+        assert N == 2
+        np.testing.assert_array_equal(columns[0], [1, 3])
+
+    def test_wrong_width_raises(self):
+        a, b = sp.symbols("a b")
+        with pytest.raises(RuntimeError):
+            param_columns([a, b], [[1, 2, 3]])
+
+
+class TestCoefficientEvaluator:
+    def test_constant_coefficients_broadcast(self):
+        a = sp.Symbol("a")
+        f = CoefficientEvaluator([[1, a], [2 * a]], [a])
+        c1, c2 = f({a: np.array([1.0, 2.0])})
+        np.testing.assert_allclose(c1, [[1, 1], [1, 2]])
+        np.testing.assert_allclose(c2, [[2], [4]])
+
+
+class TestHorner:
+    def test_matches_polyval(self):
+        coeffs = np.array([[1.0, 2.0, 3.0], [0.0, 1.0, -1.0]])
+        x = np.array([0.0, 1.0, 2j])
+        y = horner(coeffs, x)
+        for i in range(2):
+            np.testing.assert_allclose(y[i], np.polyval(coeffs[i], x))
+
+
+class TestNumericFunction:
+    t, a = sp.symbols("t a", positive=True)
+    M = sp.Matrix([
+        sp.exp(-a * t) * sp.sin(2 * t),
+        sp.exp(-a * t) * (sp.cos(2 * t) + 1),
+        sp.Integer(3),
+    ])
+
+    def expected(self, x, a):
+        return np.stack([
+            np.exp(-a * x) * np.sin(2 * x),
+            np.exp(-a * x) * (np.cos(2 * x) + 1),
+            np.full_like(x, 3.0),
+        ])
+
+    def test_numpy(self):
+        f = NumericFunction((self.t, self.a), self.M)
+        x = np.linspace(0, 5, 50)
+        assert f(x, 0.5).shape == (3, 50)
+        assert np.allclose(f(x, 0.5), self.expected(x, 0.5))
+        # Parameter arrays broadcast with the variable
+        assert np.allclose(f(x, np.full(50, 0.5)), self.expected(x, 0.5))
+
+    def test_scalar_expression(self):
+        f = NumericFunction((self.t,), sp.exp(-self.t))
+        assert np.allclose(f([0, 1]), [1, np.exp(-1)])
+
+    def test_missing_symbol_raises(self):
+        with pytest.raises(RuntimeError):
+            NumericFunction((self.t,), self.M)
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(RuntimeError):
+            NumericFunction((self.t, self.a), self.M, backend="fortran")
+
+    @pytest.mark.skipif(shutil.which("cc") is None, reason="No C compiler")
+    def test_c(self):
+        f = NumericFunction((self.t, self.a), self.M, backend="c")
+        x = np.linspace(0, 5, 50).reshape(5, 10)
+        assert np.allclose(f(x, 0.5), self.expected(x, 0.5))
+
+    @pytest.mark.parametrize(
+        "expr", ["exp(I*x)", "exp(-x)*Heaviside(x)", "DiracDelta(x)"]
+    )
+    def test_c_rejects_unsupported(self, expr):
+        x = sp.Symbol("x")
+        with pytest.raises(RuntimeError, match="C backend"):
+            NumericFunction((x,), sp.sympify(expr, locals={"x": x}), backend="c")
+
+    def test_numba(self):
+        pytest.importorskip("numba")
+        f = NumericFunction((self.t, self.a), self.M, backend="numba")
+        x = np.linspace(0, 5, 50)
+        assert np.allclose(f(x, 0.5), self.expected(x, 0.5))
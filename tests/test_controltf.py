@@ -2,7 +2,13 @@ import numpy as np
 import control
 import pytest
 
-from dysys.controltf import TransferFunction, tf
+from dysys.controltf import (
+    TransferFunction,
+    tf,
+    pair_conjugates,
+    poly_roots_many,
+    factor_canonical_many,
+)
 
 
 class TestTransferFunctionCreation:
@@ -64,15 +70,42 @@ class TestFactorCanonical:
         factors = H.factor_canonical(check=True)
         assert len(factors) >= 2  # gain + at least one factor
 
-    def test_mimo_raises(self):
-        # Create a MIMO-like system via concatenation
-        H = TransferFunction([1], [1, 1])
-        H_mimo = control.append(H, H)
-        # Wrap as our subclass manually
-        H_sub = TransferFunction.__new__(TransferFunction)
-        H_sub.__dict__.update(H_mimo.__dict__)
-        with pytest.raises(NotImplementedError):
-            H_sub.factor_canonical()
+    def test_mimo(self):
+        H = TransferFunction(
+            [[[1], [2]], [[1, 1], [3]]],
+            [[[1, 3, 2], [1, 3, 2]], [[1, 2, 5], [1, 3, 2]]],
+        )
+        factors = H.factor_canonical(check=True)
+        assert set(factors) == {(0, 0), (0, 1), (1, 0), (1, 1)}
+        for (i, j), channel_factors in factors.items():
+            product = 1
+            for f in channel_factors:
+                product *= f
+            w = np.array([0.1, 1.0, 10.0])
+            np.testing.assert_allclose(
+                product(1j * w),
+                TransferFunction(H.num[i][j], H.den[i][j])(1j * w),
+            )
+
+    def test_mimo_shared_denominators_factored_once(self, monkeypatch):
+        import dysys.controltf
+
+        calls = []
+        poly_roots_many = dysys.controltf.poly_roots_many
+
+        def counting_poly_roots_many(polys):
+            calls.append(len(polys))
+            return poly_roots_many(polys)
+
+        monkeypatch.setattr(
+            dysys.controltf, "poly_roots_many", counting_poly_roots_many
+        )
+        H = TransferFunction(
+            [[[1], [2]], [[1], [3]]],
+            [[[1, 3, 2], [1, 3, 2]], [[1, 3, 2], [1, 3, 2]]],
+        )
+        H.factor_canonical()
+        assert calls == [4]  # Numerators 1, 2, 3 and one shared denominator
 
     def test_complex_system(self):
         """Test the example from the README"""
@@ -82,3 +115,88 @@ class TestFactorCanonical:
         )
         factors = H.factor_canonical(check=True)
         assert len(factors) >= 2
+
+    def test_readme_factors(self):
+        H = TransferFunction(
+            [1_000_000, 300_000_000],
+            [1, 1030, 40200, 10_300_000, 100_000_000],
+        )
+        factors = H.factor_canonical()
+        nums = [np.array(f.num).flatten() for f in factors]
+        dens = [np.array(f.den).flatten() for f in factors]
+        np.testing.assert_allclose(nums[0], [3])
+        np.testing.assert_allclose(nums[1], [1 / 300, 1], rtol=1e-9)
+        np.testing.assert_allclose(dens[2], [0.1, 1], rtol=1e-9)
+        np.testing.assert_allclose(dens[3], [1, 20, 1e4], rtol=1e-9)
+        np.testing.assert_allclose(nums[3], [1e4], rtol=1e-9)
+        np.testing.assert_allclose(dens[4], [0.001, 1], rtol=1e-9)
+
+
+class TestPairConjugates:
+    def test_pairs(self):
+        roots = np.array([-1 - 2j, -3.0, -1 + 2j, -2 + 1j, -2 - 1j])
+        i_real, i_pairs = pair_conjugates(roots)
+        np.testing.assert_array_equal(i_real, [1])
+        for i, j in i_pairs:
+            assert np.isclose(roots[i], roots[j].conjugate())
+            assert roots[i].imag > 0
+
+    def test_noisy_conjugates(self):
+        roots = np.array([-1 + 2j, -1 - 2j + 1e-6, -1 + 2.5j, -1 - 2.5j - 1e-6j])
+        _, i_pairs = pair_conjugates(roots)
+        assert {tuple(sorted(p)) for p in i_pairs.tolist()} == {(0, 1), (2, 3)}
+
+    def test_unpaired_raises(self):
+        with pytest.raises(RuntimeError):
+            pair_conjugates([1j, -1.0])
+
+
+class TestFactorCanonicalMany:
+    def test_poly_roots_many(self):
+        polys = [[1, 3, 2], [2, 0, 8], [5], [1, 1, 1, 1]]
+        roots = poly_roots_many(polys)
+        for p, r in zip(polys, roots):
+            np.testing.assert_allclose(np.sort_complex(r), np.sort_complex(np.roots(p)))
+
+    def test_matches_factor_canonical(self):
+        Hs = [
+            TransferFunction([1], [1, 2, 5]),
+            TransferFunction([2, 1], [1, 6, 11, 6]),
+            TransferFunction(
+                [1_000_000, 300_000_000],
+                [1, 1030, 40200, 10_300_000, 100_000_000],
+            ),
+        ]
+        for factors, H in zip(factor_canonical_many(Hs), Hs):
+            expected = H.factor_canonical()
+            assert len(factors) == len(expected)
+            for f, e in zip(factors, expected):
+                np.testing.assert_allclose(
+                    np.array(f.num).flatten(), np.array(e.num).flatten()
+                )
+                np.testing.assert_allclose(
+                    np.array(f.den).flatten(), np.array(e.den).flatten()
+                )
+
+
+class TestVerifyFactors:
+    def test_ok(self):
+        H = TransferFunction([2, 1], [1, 6, 11, 6])
+        result = H.verify_factors(H.factor_canonical())
+        assert result.ok
+        assert result.max_error < 1e-10
+        assert len(result.w) == 7
+
+    def test_detects_wrong_factors(self):
+        H = TransferFunction([2, 1], [1, 6, 11, 6])
+        factors = H.factor_canonical()
+        factors[0] = 1.01 * factors[0]  # Wrong gain
+        result = H.verify_factors(factors, w=[1.0, 10.0], rtol=1e-3)
+        assert not result.ok
+        assert np.isclose(result.max_error, 0.01)
+
+    def test_check_does_not_print(self, capsys):
+        H = TransferFunction([1], [1, 2, 5])
+        H.factor_canonical(check=True)
+        H.factor_canonical(check="exact")
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+import dysys
+
+HEAVY = ["sympy", "scipy", "control", "matplotlib"]
+
+
+def run_python(code):
+    """Returns the stdout of code run in a fresh interpreter"""
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+
+class TestLazyImport:
+    def test_import_loads_no_heavy_dependencies(self):
+        out = run_python(
+            "import sys, dysys; "
+            f"print([m for m in {HEAVY!r} if m in sys.modules])"
+        )
+        assert out.strip() == "[]"
+
+    def test_symbolic_use_does_not_load_control(self):
+        out = run_python(
+            "import sys, sympy as sp, dysys; "
+            "dysys.tfs(1/(sp.Symbol('s') + 1)).poles(); "
+            "print([m for m in ['control', 'matplotlib', 'scipy'] if m in sys.modules])"
+        )
+        assert out.strip() == "[]"
+
+    def test_stability_screening_loads_no_heavy_dependencies(self):
+        out = run_python(
+            "import sys, numpy as np, dysys; "
+            "dysys.stability_many(-np.eye(2)[None]); "
+            f"print([m for m in {HEAVY!r} if m in sys.modules])"
+        )
+        assert out.strip() == "[]"
+
+    def test_startup_time(self):
+        """Guards against regressions in import time (generous bound)"""
+        out = run_python(
+            "import time; t0 = time.perf_counter(); import dysys; "
+            "print(time.perf_counter() - t0)"
+        )
+        assert float(out) < 0.2
+
+    def test_public_names(self):
+        for name in dysys.__all__:
+            assert getattr(dysys, name) is not None
+        assert "tfs" in dir(dysys)
+        assert dysys.sysdyn.StateSpace is dysys.StateSpace
+
+    def test_unknown_name_raises(self):
+        with pytest.raises(AttributeError):
+            dysys.does_not_exist
@@ -0,0 +1,88 @@
+import sympy as sp
+import pytest
+
+from dysys.laplace import (
+    cluster_roots,
+    laplace_transform,
+    inverse_laplace_transform,
+    merge_roots,
+    residue_inverse,
+)
+
+
+class TestMergeRoots:
+    def test_adds_multiplicities(self):
+        assert merge_roots({-1: 1, 0: 1}, {0: 2}) == {-1: 1, 0: 3}
+
+
+class TestClusterRoots:
+    def test_merges_split_roots(self):
+        a, d = sp.Symbol("a"), 7e-6
+        roots = {
+            sp.Float(-1 - d): 1, sp.Float(-1 + d / 2) + sp.I * sp.Float(d): 1,
+            sp.Float(-1 + d / 2) - sp.I * sp.Float(d): 1, sp.Float(-3.0): 1, -a: 2,
+        }
+        merged = cluster_roots(roots)
+        assert merged[-a] == 2 and merged[sp.Float(-3.0)] == 1
+        assert len(merged) == 3
+        (p, m), = [(p, m) for p, m in merged.items() if m == 3]
+        assert abs(complex(p) + 1) < 1e-15
+
+    def test_conjugate_clusters_stay_conjugate(self):
+        d = 2e-4
+        roots = {
+            sp.Float(-1 + d) + sp.I * sp.Float(2.0 + d): 1,
+            sp.Float(-1 - d) + sp.I * sp.Float(2.0 - d): 1,
+            sp.Float(-1 + d) - sp.I * sp.Float(2.0 + d): 1,
+            sp.Float(-1 - d) - sp.I * sp.Float(2.0 - d): 1,
+        }
+        merged = cluster_roots(roots)
+        assert len(merged) == 2
+        p = next(iter(merged))
+        assert merged[p] == 2 and merged[sp.conjugate(p)] == 2
+
+
+class TestResidueInverse:
+    def test_repeated_poles(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        f = residue_inverse(sp.Integer(1), {0: 2, -1: 2}, s, t)
+        expected = sp.inverse_laplace_transform(1 / (s**2 * (s + 1) ** 2), s, t)
+        assert sp.simplify(f - expected) == 0
+
+    def test_improper(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        f = residue_inverse(s + 2, {-1: 1}, s, t)  # 1 + 1/(s + 1)
+        assert f == sp.DiracDelta(t) + sp.exp(-t)
+
+    def test_heaviside_for_unrestricted_t(self):
+        s, t = sp.symbols("s t")
+        f = residue_inverse(sp.Integer(1), {-1: 1}, s, t)
+        assert f == sp.exp(-t) * sp.Heaviside(t)
+
+
+class TestInverseLaplaceTransform:
+    def test_symbolic_quadratic(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        a = sp.Symbol("a", positive=True)
+        F = 1 / (s**2 + a * s + 1)
+        f = inverse_laplace_transform(F, s, t)
+        # Check against the ODE f'' + a f' + f = 0, f(0) = 0, f'(0) = 1
+        assert sp.simplify(f.diff(t, 2) + a * f.diff(t) + f) == 0
+        assert sp.simplify(f.subs(t, 0)) == 0
+        assert sp.simplify(f.diff(t).subs(t, 0)) == 1
+
+    def test_zero(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        assert inverse_laplace_transform(sp.S.Zero, s, t) == 0
+
+
+class TestLaplaceTransform:
+    def test_memoized(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        assert laplace_transform(sp.sin(t), t, s) == 1 / (s**2 + 1)
+        assert laplace_transform(sp.sin(t), t, s) is laplace_transform(sp.sin(t), t, s)
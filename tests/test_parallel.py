@@ -0,0 +1,21 @@
+from functools import partial
+
+import sympy as sp
+
+from dysys.parallel import applyfunc, integrate
+
+
+class TestApplyfunc:
+    def test_matches_serial(self):
+        x = sp.Symbol("x")
+        M = sp.Matrix([[sp.sin(x)**2 + sp.cos(x)**2, 0], [x*(x + 1) - x**2, 2]])
+        assert applyfunc(M, sp.simplify, processes=2) == M.applyfunc(sp.simplify)
+
+    def test_keeps_matrix_type(self):
+        x = sp.Symbol("x")
+        M = sp.SparseMatrix(3, 3, {(0, 0): x, (2, 1): 2 * x})
+        result = applyfunc(M, partial(integrate, limits=(x, 0, 1)), processes=2)
+        assert isinstance(result, sp.SparseMatrix)
+        assert result == sp.SparseMatrix(3, 3, {(0, 0): sp.S.Half, (2, 1): 1})
+        immutable = applyfunc(M.as_immutable(), sp.expand, processes=2)
+        assert isinstance(immutable, sp.ImmutableSparseMatrix)
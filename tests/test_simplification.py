@@ -0,0 +1,43 @@
+import time
+
+import pytest
+import sympy as sp
+
+from dysys.simplification import cheap_simplify, simplify
+
+
+t = sp.Symbol("t", positive=True)
+x = sp.Symbol("x")
+
+
+class TestCheapSimplify:
+    def test_cancels_exponentials(self):
+        expr = (sp.exp(-t) * sp.sin(2 * t) / 2 + 5 * sp.exp(-t)) * sp.exp(t) / (x + 1) \
+            - 5 / (x + 1)
+        assert sp.simplify(cheap_simplify(expr) - sp.sin(2 * t) / (2 * x + 2)) == 0
+        assert sp.count_ops(cheap_simplify(expr)) < sp.count_ops(expr)
+
+
+class TestSimplify:
+    expr = sp.sin(x)**2 + sp.cos(x)**2 + (x**2 - 1) / (x - 1)
+
+    def test_policies(self):
+        assert simplify(self.expr, "none") is self.expr
+        assert simplify(self.expr, "cheap") == sp.sin(x)**2 + sp.cos(x)**2 + x + 1
+        assert simplify(self.expr, "full") == x + 2
+
+    def test_unknown_policy_raises(self):
+        with pytest.raises(RuntimeError):
+            simplify(self.expr, "aggressive")
+
+    def test_budget(self):
+        assert simplify(self.expr, budget=3) is self.expr
+        assert simplify(self.expr, budget=100) == x + 2
+
+    def test_timeout(self):
+        assert simplify(self.expr, timeout=60) == x + 2
+
+    def test_timeout_falls_back(self):
+        start = time.perf_counter()
+        assert simplify(self.expr, "full", timeout=0) is self.expr
+        assert time.perf_counter() - start < 10
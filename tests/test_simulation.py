@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from dysys.simulation import (
+    zoh_discretize,
+    uniform_step,
+    input_array,
+    simulate_discrete,
+    simulate_batch,
+    input_chunks,
+    simulate_stream,
+)
+
+
+class TestZohDiscretize:
+    def test_first_order(self):
+        Ad, Bd = zoh_discretize(np.array([[-2.0]]), np.array([[4.0]]), 0.1)
+        np.testing.assert_allclose(Ad, [[np.exp(-0.2)]])
+        np.testing.assert_allclose(Bd, [[2 * (1 - np.exp(-0.2))]])
+
+
+class TestUniformStep:
+    def test_step(self):
+        assert np.isclose(uniform_step(np.linspace(0, 1, 11)), 0.1)
+
+    def test_nonuniform_raises(self):
+        with pytest.raises(RuntimeError):
+            uniform_step([0, 1, 3])
+
+
+class TestInputArray:
+    def test_shapes(self):
+        assert input_array(None, 2, 5).shape == (2, 5)
+        assert input_array(1.0, 1, 5).shape == (1, 5)
+        assert input_array(np.arange(5), 1, 5).shape == (1, 5)
+        with pytest.raises(RuntimeError):
+            input_array(np.zeros((2, 4)), 2, 5)
+
+
+class TestSimulateDiscrete:
+    def test_step_response(self):
+        Ad, Bd = zoh_discretize(np.array([[-1.0]]), np.array([[1.0]]), 0.01)
+        t = np.arange(0, 5, 0.01)
+        x, y = simulate_discrete(
+            Ad, Bd, np.array([[1.0]]), np.array([[0.0]]), np.zeros(1),
+            np.ones((1, len(t))),
+        )
+        np.testing.assert_allclose(y[0], 1 - np.exp(-t), atol=1e-12)
+
+
+class TestSimulateBatch:
+    def test_matches_single(self):
+        A = np.array([[[-1.0]], [[-2.0]]])
+        B = np.array([[[1.0]], [[2.0]]])
+        C = np.ones((2, 1, 1))
+        D = np.zeros((2, 1, 1))
+        Ad, Bd = zoh_discretize(A, B, 0.1)
+        u = np.ones((1, 20))
+        x, y = simulate_batch(Ad, Bd, C, D, np.zeros(1), u)
+        for i in range(2):
+            _, y_i = simulate_discrete(Ad[i], Bd[i], C[i], D[i], np.zeros(1), u)
+            np.testing.assert_allclose(y[i], y_i)
+
+
+class TestSimulateStream:
+    rng = np.random.default_rng(0)
+    Ad, Bd = zoh_discretize(np.array([[0.0, 1.0], [-2.0, -0.5]]), np.eye(2), 0.01)
+    C = np.array([[1.0, 0.0]])
+    D = np.array([[0.0, 0.5]])
+    x0 = np.array([1.0, -1.0])
+    u = rng.standard_normal((2, 1000))
+
+    def test_matches_simulate_discrete(self):
+        x, y = simulate_discrete(self.Ad, self.Bd, self.C, self.D, self.x0, self.u)
+        chunks = list(simulate_stream(
+            self.Ad, self.Bd, self.C, self.D, self.x0, self.u, chunk_size=64, states=True
+        ))
+        assert len(chunks) == 16
+        assert np.allclose(np.concatenate([c[0] for c in chunks], axis=1), x)
+        assert np.allclose(np.concatenate([c[1] for c in chunks], axis=1), y)
+
+    def test_iterator_and_out(self):
+        _, y = simulate_discrete(self.Ad, self.Bd, self.C, self.D, self.x0, self.u)
+        chunks = (self.u[:, k:k + n] for k, n in [(0, 1), (1, 300), (301, 699)])
+        out = np.zeros((1, 1000))
+        for _ in simulate_stream(self.Ad, self.Bd, self.C, self.D, self.x0, chunks, out=out):
+            pass
+        assert np.allclose(out, y)
+
+    def test_memmap(self, tmp_path):
+        u = np.memmap(tmp_path / "u.dat", dtype=np.float64, mode="w+", shape=(2, 1000))
+        u[:] = self.u
+        out = np.memmap(tmp_path / "y.dat", dtype=np.float64, mode="w+", shape=(1, 1000))
+        _, y = simulate_discrete(self.Ad, self.Bd, self.C, self.D, self.x0, self.u)
+        for y_k in simulate_stream(
+                self.Ad, self.Bd, self.C, self.D, self.x0, u, chunk_size=100, out=out
+            ):
+            assert y_k.shape == (1, 100)
+        assert np.allclose(out, y)
+
+    def test_input_chunks(self):
+        chunks = list(input_chunks(np.arange(10.0), 1, 4))
+        assert [c.shape for c in chunks] == [(1, 4), (1, 4), (1, 2)]
+        with pytest.raises(RuntimeError):
+            list(input_chunks([np.zeros((3, 5))], 2, 4))
@@ -1,7 +1,12 @@
+import subprocess
+import sys
+
 import sympy as sp
 import numpy as np
 import pytest
 
+from sympy.matrices.exceptions import MatrixError
+
 from dysys.statespacesymbolic import StateSpaceSymbolic, sss
 
 
@@ -77,6 +82,54 @@ class TestStateTransitionMatrix:
         assert Phi[0, 1] == 0
         assert Phi[1, 0] == 0
 
+    @pytest.mark.parametrize("method", ["auto", "modal", "jordan", "exp"])
+    def test_methods_agree(self, method):
+        t = sp.Symbol("t", positive=True)
+        A = sp.Matrix([[-4, -3, 0], [0, -8, 4], [0, 0, -1]])
+        sys = StateSpaceSymbolic(A, [[0], [1], [0]], [[0, 1, 0]], [[0]])
+        Phi = sys.state_transition_matrix(t, method=method)
+        assert sp.simplify(Phi - sp.exp(A * t)) == sp.zeros(3)
+
+    def test_complex_eigenvalues_real_result(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[0, 1], [-5, -2]], [[0], [1]], [[1, 0]], [[0]])
+        Phi = sys.state_transition_matrix(t, method="modal")
+        assert not Phi.has(sp.I)
+        assert sp.simplify(Phi[0, 1] - sp.exp(-t) * sp.sin(2 * t) / 2) == 0
+
+    def test_repeated_eigenvalues(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1, 1], [0, -1]], [[0], [1]], [[1, 0]], [[0]])
+        Phi = sys.state_transition_matrix(t)  # Not diagonalizable: uses Jordan form
+        assert Phi == sp.Matrix([[sp.exp(-t), t * sp.exp(-t)], [0, sp.exp(-t)]])
+        with pytest.raises(MatrixError):
+            sys.state_transition_matrix(t, method="modal")
+
+    def test_unknown_method_raises(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1]], [[1]], [[1]], [[0]])
+        with pytest.raises(RuntimeError):
+            sys.state_transition_matrix(t, method="pade")
+
+    @pytest.mark.parametrize("method", ["auto", "modal", "jordan"])
+    def test_roots_not_in_radicals_raise(self, method):
+        """The eigenvalues are CRootOf; run in a subprocess so a hang fails"""
+        code = (
+            "import sympy as sp; from dysys import sss; "
+            "A = [[-1, 2, 0, 0, 0], [0, -2, 1, 0, 0], [0, 0, -3, 1, 0], "
+            "[1, 0, 0, -4, 1], [0, 0, 1, 0, -5]]; "
+            "system = sss(A, [[1]] * 5, [[1, 0, 0, 0, 0]], [[0]])\n"
+            "try:\n"
+            f"    system.state_transition_matrix(sp.Symbol('t'), method={method!r})\n"
+            "except RuntimeError:\n"
+            "    print('raised')"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, 
+            check=True, timeout=60,
+        ).stdout
+        assert out.strip() == "raised"
+
 
 class TestFreeResponse:
     def test_state_free_response(self):
@@ -135,3 +188,316 @@ class TestToControl:
         sys = StateSpaceSymbolic([[-1, 0], [0, -2]], [[1], [0]], [[1, 0]], [[0]])
         css = sys.to_control()
         assert isinstance(css, control.StateSpace)
+
+
+class TestCache:
+    def test_phi_cached_per_time_symbol(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1, 1], [0, -2]], [[1], [0]], [[1, 0]], [[0]])
+        Phi = sys.state_transition_matrix(t)
+        Phi[0, 0] = 0  # Mutating the returned matrix must not corrupt the cache
+        assert sys.state_transition_matrix(t)[0, 0] == sp.exp(-t)
+        tau = sp.Symbol("tau")
+        assert sys.state_transition_matrix(tau)[0, 0] == sp.exp(-tau)
+
+    def test_invalidated_when_a_changes(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1, 0], [0, -2]], [[1], [0]], [[1, 0]], [[0]])
+        assert sys.state_transition_matrix(t)[0, 0] == sp.exp(-t)
+        sys.A[0, 0] = -3  # In-place change
+        assert sys.state_transition_matrix(t)[0, 0] == sp.exp(-3 * t)
+        sys.A = sp.Matrix([[-5, 0], [0, -2]])  # Reassignment
+        assert sys.state_transition_matrix(t)[0, 0] == sp.exp(-5 * t)
+        L, M = sys.eig()
+        assert {L[0, 0], L[1, 1]} == {-5, -2}
+
+    def test_diag_transformation_matches_sympy(self):
+        A = sp.Matrix([[1, 2, 0], [0, 3, 0], [2, -4, 2]])
+        sys = StateSpaceSymbolic(A, [[1], [0], [0]], [[1, 0, 0]], [[0]])
+        assert sys.diag_transformation() == A.diagonalize(sort=True)
+        assert sys.diag_transformation(normalize=True) == A.diagonalize(
+            sort=True, normalize=True
+        )
+
+    def test_not_diagonalizable(self):
+        sys = StateSpaceSymbolic([[-1, 1], [0, -1]], [[0], [1]], [[1, 0]], [[0]])
+        assert sys.is_diagonalizable() is False
+        with pytest.raises(MatrixError):
+            sys.diag_transformation()
+
+
+class TestBlocks:
+    """A with decoupled blocks [[-1, 1], [0, -2]] (states 0, 2) and 
+    [[0, 1], [-4, 0]] (states 1, 3), interleaved
+    """
+
+    A = sp.Matrix([[-1, 0, 1, 0], [0, 0, 0, 1], [0, 0, -2, 0], [0, -4, 0, 0]])
+
+    def test_blocks(self):
+        sys = StateSpaceSymbolic(self.A, sp.ones(4, 1), sp.ones(1, 4), [[0]])
+        assert sys.blocks() == [[0, 2], [1, 3]]
+        assert sorted(sys.blocks(triangular=True)) == [[0], [1, 3], [2]]
+
+    def test_eigenvals_block_triangular(self):
+        A = sp.Matrix([[-1, 5, 0], [0, -2, 0], [3, 1, -1]])  # Coupled one way
+        sys = StateSpaceSymbolic(A, sp.ones(3, 1), sp.ones(1, 3), [[0]])
+        assert len(sys.blocks()) == 1
+        assert sys.eigenvals() == A.eigenvals()
+
+    @pytest.mark.parametrize("method", ["auto", "modal", "jordan", "exp"])
+    def test_phi_matches_dense(self, method):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic(self.A, sp.ones(4, 1), sp.ones(1, 4), [[0]])
+        Phi = sys.state_transition_matrix(t, method=method)
+        assert sp.simplify(Phi - sp.exp(self.A * t)) == sp.zeros(4, 4)
+
+    def test_eig_and_jordan_form(self):
+        sys = StateSpaceSymbolic(self.A, sp.ones(4, 1), sp.ones(1, 4), [[0]])
+        L, M = sys.eig()
+        assert sp.simplify(self.A * M - M * L) == sp.zeros(4, 4)
+        P, J = sys.jordan_form()
+        assert sp.simplify(P * J * P.inv()) == self.A
+        assert sys.diag_transformation() == self.A.diagonalize(sort=True)
+
+    def test_shared_eigenvalue_merged(self):
+        A = sp.diag(sp.Matrix([[-1, 1], [0, -1]]), sp.Matrix([[-1]]))
+        sys = StateSpaceSymbolic(A, sp.ones(3, 1), sp.ones(1, 3), [[0]])
+        assert sys.is_diagonalizable() is False
+        t = sp.Symbol("t", positive=True)
+        assert sys.state_transition_matrix(t)[0, 1] == t * sp.exp(-t)
+
+    def test_sparse(self):
+        t = sp.Symbol("t", positive=True)
+        n = 20
+        A = sp.SparseMatrix(n, n, {(i, i): -(i + 1) for i in range(n)})
+        sys = StateSpaceSymbolic(A, sp.SparseMatrix(sp.ones(n, 1)), sp.ones(1, n), [[0]])
+        assert isinstance(sys.A, sp.SparseMatrix)
+        Phi = sys.state_transition_matrix(t)
+        assert isinstance(Phi, sp.SparseMatrix)
+        assert Phi == sp.diag(*[sp.exp(-(i + 1) * t) for i in range(n)])
+
+
+class TestParallel:
+    def test_forced_response_matches_serial(self):
+        t = sp.Symbol("t", positive=True)
+        A = sp.Matrix([[0, 1], [-5, -2]])
+        serial = StateSpaceSymbolic(A, [[0], [1]], [[1, 0]], [[0]])
+        parallel = StateSpaceSymbolic(A, [[0], [1]], [[1, 0]], [[0]])
+        x_parallel = parallel.state_forced_response(t, 1, processes=2)
+        assert sp.simplify(x_parallel - serial.state_forced_response(t, 1)) == sp.zeros(2, 1)
+        assert parallel.state_transition_matrix(t) == serial.state_transition_matrix(t)
+
+
+class TestForcedResponseSimplify:
+    def test_policies_agree(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[0, 1], [-5, -2]], [[0], [1]], [[1, 0]], [[0]])
+        x_full = sys.state_forced_response(t, 1)
+        assert sys.state_forced_response(t, 1, simplify="full") == x_full
+        for policy in ["none", "cheap"]:
+            x = sys.state_forced_response(t, 1, simplify=policy)
+            assert sp.simplify(x - x_full) == sp.zeros(2, 1)
+        x_none = sys.state_forced_response(t, 1, simplify="none")
+        assert sum(map(sp.count_ops, x_full)) < sum(map(sp.count_ops, x_none))
+
+    def test_bounds_fall_back_to_unsimplified(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[0, 1], [-5, -2]], [[0], [1]], [[1, 0]], [[0]])
+        x_none = sys.state_forced_response(t, 1, simplify="none")
+        assert sys.state_forced_response(t, 1, budget=1) == x_none
+        assert sys.state_forced_response(t, 1, timeout=0) == x_none
+        assert sys.output_response(t, u=1, simplify="none") == sys.C * x_none
+
+
+class TestForcedResponseLaplace:
+    @pytest.mark.parametrize(
+        "u",
+        [
+            sp.Heaviside(sp.Symbol("t", nonnegative=True)),
+            sp.Symbol("t", nonnegative=True),
+            sp.sin(3 * sp.Symbol("t", nonnegative=True)),
+            sp.exp(-2 * sp.Symbol("t", nonnegative=True)),
+        ],
+    )
+    def test_matches_convolution(self, u):
+        t = sp.Symbol("t", nonnegative=True)
+        A = [[-4, -3, 0], [0, -8, 4], [0, 0, -1]]
+        sys = StateSpaceSymbolic(A, [[0], [1], [0]], [[0, 1, 0]], [[0]])
+        x_conv = sys.state_forced_response(t, u)
+        x_lap = sys.state_forced_response(t, u, method="laplace")
+        assert sp.simplify(x_conv - x_lap) == sp.zeros(3, 1)
+
+    def test_two_inputs(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic(
+            [[-1, 0], [0, -2]], [[1, 0], [0, 1]], [[1, 1]], [[0, 0]]
+        )
+        x = sys.state_forced_response(t, [1, sp.exp(-t)], method="laplace")
+        assert sp.simplify(x[0] - (1 - sp.exp(-t))) == 0
+        assert sp.simplify(x[1] - (sp.exp(-t) - sp.exp(-2 * t))) == 0
+
+    def test_parameter_named_s(self):
+        t = sp.Symbol("t", positive=True)
+        s = sp.Symbol("s", positive=True)
+        sys = StateSpaceSymbolic([[-s]], [[1]], [[1]], [[0]])
+        x = sys.state_forced_response(t, 1, method="laplace")
+        assert sp.simplify(x[0] - (1 - sp.exp(-s * t)) / s) == 0
+
+    def test_output_response(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1, 0], [0, -2]], [[1], [0]], [[1, 0]], [[0]])
+        y = sys.output_response(t, x0=[1, 0], u=1, method="laplace")
+        assert sp.simplify(y[0] - 1) == 0
+
+    def test_unknown_method_raises(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic([[-1]], [[1]], [[1]], [[0]])
+        with pytest.raises(RuntimeError):
+            sys.state_forced_response(t, 1, method="fourier")
+
+
+class TestResolvent:
+    def test_matches_inverse(self):
+        s = sp.Symbol("s")
+        A = sp.Matrix([[0, 1], [-2, -3]])
+        sys = StateSpaceSymbolic(A, [[0], [1]], [[1, 0]], [[0]])
+        R = sys.resolvent(s)
+        assert sp.simplify(R - (s * sp.eye(2) - A).inv()) == sp.zeros(2)
+
+
+class TestTransferMatrix:
+    def test_matches_inverse(self):
+        s = sp.Symbol("s")
+        k, b = sp.symbols("k b", positive=True)
+        A = sp.Matrix([[0, 1, 0], [-k, -b, 1], [0, 0, -2]])
+        B = sp.Matrix([[0, 0], [1, 0], [0, b]])
+        C = sp.Matrix([[1, 0, 0], [0, 1, 1]])
+        D = sp.Matrix([[0, 0], [0, 1]])
+        sys = StateSpaceSymbolic(A, B, C, D)
+        N, den = sys.transfer_matrix(s)
+        assert sp.expand(den - (s * sp.eye(3) - A).det()) == 0
+        G = C * (s * sp.eye(3) - A).inv() * B + D
+        assert (G - N / den).applyfunc(sp.cancel) == sp.zeros(2, 2)
+
+    def test_to_tfs_siso(self):
+        s = sp.Symbol("s")
+        sys = StateSpaceSymbolic([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]], [[0]])
+        H = sys.to_tfs(s)
+        assert sp.cancel(H.H - 1 / (s**2 + 3 * s + 2)) == 0
+        assert H.poles() == {-1: 1, -2: 1}
+
+    def test_to_tfs_mimo_shares_denominator(self):
+        s = sp.Symbol("s")
+        sys = StateSpaceSymbolic(
+            [[-1, 1], [0, -2]], [[1, 0], [0, 1]], [[1, 0], [0, 1]], [[0, 0], [0, 0]]
+        )
+        H = sys.to_tfs(s)
+        assert len(H) == 2 and len(H[0]) == 2
+        dens = {H_ij.den for row in H for H_ij in row if H_ij.H != 0}
+        assert dens == {s**2 + 3 * s + 2}
+        assert sp.cancel(H[0][1].H - 1 / ((s + 1) * (s + 2))) == 0
+        assert H[1][0].H == 0
+
+
+class TestNumeric:
+    def test_matches_lambdify(self):
+        t = sp.Symbol("t", positive=True)
+        sys = StateSpaceSymbolic(
+            [[0, 1], [-5, -2]], [[0], [1]], [[1, 0], [0, 1]], [[0], [0]]
+        )
+        f = sys.numeric(t, x0=[1, 0], u=1)
+        y = sys.output_response(t, x0=[1, 0], u=1)
+        x = np.linspace(0, 3, 20)
+        assert np.allclose(f(x), np.array(sp.lambdify(t, y, "numpy")(x)).reshape(2, -1))
+        assert sys.numeric(t, x0=[1, 0], u=1) is f
+        assert sys.numeric(t, x0=[1, 0], u=1, output=False)(x).shape == (2, 20)
+
+    def test_parameters(self):
+        t = sp.Symbol("t", positive=True)
+        a = sp.Symbol("a", positive=True)
+        sys = StateSpaceSymbolic([[-a]], [[1]], [[1]], [[0]])
+        f = sys.numeric(t, u=1, method="laplace")
+        assert f.args == (t, a)
+        assert np.allclose(f([0, 1], 2.0), [[0, (1 - np.exp(-2)) / 2]])
+
+
+class TestSimulate:
+    def test_matches_symbolic_response(self):
+        t = sp.Symbol("t", nonnegative=True)
+        A = [[-4, -3, 0], [0, -8, 4], [0, 0, -1]]
+        sys = StateSpaceSymbolic(A, [[0], [1], [0]], [[0, 1, 0]], [[0]])
+        x0 = [1, 0, 2]
+        y_sym = sys.output_response(t, x0=x0, u=1, method="laplace")
+        y_fun = sp.lambdify(t, y_sym[0], "numpy")
+        t_ = np.linspace(0, 5, 501)
+        x, y = sys.simulate(t_, x0=x0, u=np.ones_like(t_))
+        assert x.shape == (3, 501)
+        np.testing.assert_allclose(y[0], y_fun(t_), atol=1e-10)
+
+    def test_params_and_cache(self):
+        a = sp.Symbol("a")
+        sys = StateSpaceSymbolic([[-a]], [[a]], [[1]], [[0]])
+        t_ = np.linspace(0, 1, 11)
+        x, y = sys.simulate(t_, u=1.0, params={a: 2.0})
+        np.testing.assert_allclose(y[0], 1 - np.exp(-2 * t_), atol=1e-12)
+        assert sys.discretize(0.1, params={a: 2.0}) is sys.discretize(
+            0.1, params={a: 2.0}
+        )
+
+    def test_b_change_invalidates(self):
+        sys = StateSpaceSymbolic([[-1]], [[1]], [[1]], [[0]])
+        t_ = np.linspace(0, 1, 11)
+        _, y1 = sys.simulate(t_, u=1.0)
+        sys.B = sp.Matrix([[2]])
+        _, y2 = sys.simulate(t_, u=1.0)
+        np.testing.assert_allclose(y2, 2 * y1)
+
+
+class TestSimulateStream:
+    def test_matches_simulate(self):
+        k = sp.Symbol("k", positive=True)
+        sys = StateSpaceSymbolic([[0, 1], [-k, -1]], [[0], [1]], [[1, 0]], [[0]])
+        t = np.linspace(0, 10, 1001)
+        u = np.sin(t)
+        _, y = sys.simulate(t, x0=[1, 0], u=u, params={k: 2.0})
+        chunks = sys.simulate_stream(
+            iter(np.array_split(u, 7)), t[1] - t[0], x0=[1, 0], params={k: 2.0}
+        )
+        assert np.allclose(np.concatenate(list(chunks), axis=1), y)
+
+
+class TestBatch:
+    def test_to_numpy_batch_matches_to_numpy(self):
+        a, b = sp.symbols("a b")
+        sys = StateSpaceSymbolic([[0, 1], [-a, -b]], [[0], [a]], [[1, 0]], [[0]])
+        values = {a: np.array([1.0, 4.0, 9.0]), b: np.array([0.5, 1.0, 2.0])}
+        A, B, C, D = sys.to_numpy_batch(values, params=[a, b])
+        assert A.shape == (3, 2, 2)
+        assert B.shape == (3, 2, 1)
+        assert C.shape == (3, 1, 2)
+        assert D.shape == (3, 1, 1)
+        for i in range(3):
+            A_i, B_i, _, _ = sys.to_numpy(params={a: values[a][i], b: values[b][i]})
+            np.testing.assert_allclose(A[i], A_i)
+            np.testing.assert_allclose(B[i], B_i)
+
+    def test_simulate_many_matches_simulate(self):
+        a = sp.Symbol("a")
+        sys = StateSpaceSymbolic([[-a, 0], [1, -2]], [[a], [0]], [[0, 1]], [[0]])
+        t_ = np.linspace(0, 2, 201)
+        values = np.array([[0.5], [1.0], [3.0]])
+        x, y = sys.simulate_many(t_, values, x0=[1, 0], u=np.ones_like(t_))
+        assert x.shape == (3, 2, 201)
+        assert y.shape == (3, 1, 201)
+        for i, a_ in enumerate(values[:, 0]):
+            _, y_i = sys.simulate(t_, x0=[1, 0], u=np.ones_like(t_), params={a: a_})
+            np.testing.assert_allclose(y[i], y_i, atol=1e-12)
+
+    def test_simulate_many_processes(self):
+        a = sp.Symbol("a")
+        sys = StateSpaceSymbolic([[-a]], [[a]], [[1]], [[0]])
+        t_ = np.linspace(0, 1, 11)
+        values = np.linspace(1, 4, 5).reshape(-1, 1)
+        _, y1 = sys.simulate_many(t_, values, u=1.0)
+        _, y2 = sys.simulate_many(t_, values, u=1.0, processes=2)
+        np.testing.assert_allclose(y1, y2)
@@ -2,10 +2,20 @@ import numpy as np
 import sympy as sp
 import pytest
 
+from fractions import Fraction
+
 from dysys.sysdyn import (
+    limit_denominator,
     eigenvalue_matrix_np2sp,
     modal_matrix_np2sp,
     stability_from_eigenvalues,
+    Stability,
+    classify_stability,
+    stability_many,
+    eigvals_many,
+    natural_frequencies,
+    damping_ratios,
+    time_constants,
     StateSpace,
 )
 
@@ -30,6 +40,30 @@ class TestEigenvalueMatrixNp2sp:
         assert L[1, 1] == sp.nsimplify(-1 - 2j)
 
 
+    def test_max_denominator(self):
+        evals = [-1 / 3 + 1e-12, -0.5 + 2.25j, -0.5 - 2.25j]
+        L = eigenvalue_matrix_np2sp(evals, max_denominator=100)
+        assert L[0, 0] == sp.Rational(-1, 3)
+        assert L[1, 1] == sp.Rational(-1, 2) + sp.Rational(9, 4) * sp.I
+        assert L[2, 2] == sp.Rational(-1, 2) - sp.Rational(9, 4) * sp.I
+        assert L[0, 1] == 0
+
+
+class TestLimitDenominator:
+    def test_matches_fraction(self):
+        x = np.random.default_rng(0).standard_normal(500) * 10
+        for max_denominator in [1, 10, 1000]:
+            p, q = limit_denominator(x, max_denominator)
+            for xi, pi, qi in zip(x, p, q):
+                f = Fraction(xi).limit_denominator(max_denominator)
+                assert (pi, qi) == (f.numerator, f.denominator)
+
+    def test_edge_cases(self):
+        p, q = limit_denominator([0.0, -2.0, 1e-300, np.pi], 1000)
+        assert list(p) == [0, -2, 0, 355]
+        assert list(q) == [1, 1, 1, 113]
+
+
 class TestModalMatrixNp2sp:
     def test_basic(self):
         evecs = np.array([[1, 0], [0, 1]], dtype=float)
@@ -44,6 +78,15 @@ class TestModalMatrixNp2sp:
         assert M[1, 1] == -1
 
 
+    def test_max_denominator(self):
+        evecs = np.array([[0.7071067811865476, -0.25], [0.7071067811865476, 0.5 + 1e-13]])
+        M = modal_matrix_np2sp(evecs, max_denominator=1000)
+        assert M == sp.Matrix([
+            [sp.Rational(408, 577), sp.Rational(-1, 4)],
+            [sp.Rational(408, 577), sp.Rational(1, 2)],
+        ])
+
+
 class TestStabilityFromEigenvalues:
     def test_stable(self):
         assert stability_from_eigenvalues([-1, -2, -3]) == "stable"
@@ -63,6 +106,9 @@ class TestStabilityFromEigenvalues:
     def test_imaginary_marginally_stable(self):
         assert stability_from_eigenvalues([2j, -2j]) == "marginally stable"
 
+    def test_empty(self):
+        assert stability_from_eigenvalues([]) == "stable"
+
 
 class TestStateSpace:
     def test_creation(self):
@@ -76,3 +122,98 @@ class TestStateSpace:
         # Eigenvalues of [[0,1],[-2,-3]] are -1 and -2
         assert np.allclose(sorted(np.real(evals)), [-3, 0], atol=0.1) or \
                np.allclose(sorted(np.real(evals)), [-2, -1])
+
+    def test_eig_cached(self):
+        sys = StateSpace([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]], [[0]])
+        evals, _ = sys.eig()
+        evals[0] = 100  # Returned arrays are copies
+        assert np.allclose(sorted(sys.eigvals().real), [-2, -1])
+        assert sys.eigvals() is not sys.eigvals()
+
+    def test_eig_invalidated_when_A_changes(self):
+        sys = StateSpace([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]], [[0]])
+        assert sys.stability() == "stable"
+        sys.A[1, 1] = 3.0  # In place
+        assert sys.stability() == "unstable"
+        sys.A = np.array([[0.0, 1.0], [-4.0, 0.0]])
+        assert sys.stability() == "marginally stable"
+        assert np.allclose(sorted(sys.eigvals().imag), [-2, 2])
+
+    def test_modal_quantities(self):
+        # Poles -1 +/- 2j: wn = sqrt(5), zeta = 1/sqrt(5), tau = 1
+        sys = StateSpace([[0, 1], [-5, -2]], [[0], [1]], [[1, 0]], [[0]])
+        assert np.allclose(sys.natural_frequencies(), np.sqrt(5))
+        assert np.allclose(sys.damping_ratios(), 1 / np.sqrt(5))
+        assert np.allclose(sys.time_constants(), 1)
+
+
+    def test_simulate_stream(self):
+        sys = StateSpace([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]], [[0]])
+        u = np.ones(5000)
+        y = np.concatenate(list(sys.simulate_stream(u, dt=0.01, chunk_size=512)), axis=1)
+        assert y.shape == (1, 5000)
+        assert np.isclose(y[0, -1], 0.5, atol=1e-6)  # DC gain
+        with pytest.raises(RuntimeError):
+            next(sys.simulate_stream(u))  # Continuous time needs dt
+
+    def test_simulate_stream_discrete_time_step(self):
+        sys = StateSpace([[0.5]], [[1]], [[1]], [[0]], 0.1)
+        u = np.ones(100)
+        y = np.concatenate(list(sys.simulate_stream(u, dt=0.1)), axis=1)
+        assert np.isclose(y[0, -1], 2.0)
+        with pytest.raises(RuntimeError):
+            sys.simulate_stream(u, dt=0.2)
+
+
+class TestModalQuantities:
+    def test_natural_frequencies(self):
+        assert np.allclose(natural_frequencies([-3, 4j, -3 + 4j]), [3, 4, 5])
+
+    def test_damping_ratios(self):
+        zeta = damping_ratios([-2, 1j, 0, 1])
+        assert np.allclose(zeta[[0, 1, 3]], [1, 0, -1])
+        assert np.isnan(zeta[2])
+
+    def test_time_constants(self):
+        assert np.allclose(time_constants([-2, -0.5 + 1j, 1j, 4]), [0.5, 2, np.inf, -0.25])
+
+    def test_batched(self):
+        evals = np.array([[-1 + 1j, -1 - 1j], [-2, -4]])
+        assert damping_ratios(evals).shape == (2, 2)
+
+
+class TestEigvalsMany:
+    def test_matches_single(self):
+        rng = np.random.default_rng(0)
+        A = rng.standard_normal((50, 4, 4))
+        evals = eigvals_many(A)
+        assert evals.shape == (50, 4)
+        for Ak, ek in zip(A, evals):
+            assert np.allclose(np.sort_complex(ek), np.sort_complex(np.linalg.eigvals(Ak)))
+
+
+class TestStabilityMany:
+    def test_classify(self):
+        evals = np.array([[-1, -2], [-1, 0], [-1, 2], [2j, -2j], [1 + 1j, 1 - 1j]])
+        labels = classify_stability(evals)
+        assert labels.dtype == np.int8
+        assert list(labels) == [
+            Stability.STABLE, Stability.MARGINAL, Stability.UNSTABLE,
+            Stability.MARGINAL, Stability.UNSTABLE,
+        ]
+
+    def test_tolerance(self):
+        evals = [[-1e-12, -1], [1e-12, -1], [-1e-3, -1]]
+        assert list(classify_stability(evals)) == [0, 2, 0]
+        assert list(classify_stability(evals, tol=1e-9)) == [1, 1, 0]
+        assert stability_from_eigenvalues([1e-12, -1], tol=1e-9) == "marginally stable"
+
+    def test_stack_matches_single(self):
+        rng = np.random.default_rng(1)
+        A = rng.standard_normal((200, 3, 3))
+        A[:50] = np.diag([0.0, -1.0, -2.0])  # Marginally stable
+        labels = stability_many(A)
+        names = {0: "stable", 1: "marginally stable", 2: "unstable"}
+        for Ak, label in zip(A, labels):
+            assert names[label] == stability_from_eigenvalues(np.linalg.eigvals(Ak))
+        assert np.all(labels[:50] == Stability.MARGINAL)
@@ -101,6 +101,109 @@ class TestDCGain:
         H = tfs(10 / (s**2 + 3 * s + 5), s=s)
         assert H.dc_gain() == 2
 
+    def test_simplify_policy(self):
+        s = sp.Symbol("s")
+        a = sp.Symbol("a", positive=True)
+        H = tfs((s + a**2 - a) / ((s + a) * (s + 1)), s=s)
+        assert H.dc_gain(simplify="none") == (a**2 - a) / a
+        assert H.dc_gain(simplify="cheap") == a - 1
+        assert H.dc_gain(budget=0) == H.dc_gain(simplify="none")
+
+    def test_parameters(self):
+        s = sp.Symbol("s")
+        k, m, b = sp.symbols("k m b", positive=True)
+        H = tfs((b * s + k) / (m * s**2 + b * s + k), s=s)
+        assert H.dc_gain() == 1
+
+    def test_integrator(self):
+        s = sp.Symbol("s")
+        H = tfs(1 / (s * (s + 1)), s=s)
+        assert H.dc_gain() == sp.zoo
+
+    def test_integrator_float_coefficients(self):
+        s = sp.Symbol("s")
+        H = tfs((s**2 - 1.0) / (s**3 + 2.0 * s**2 + s), s=s)
+        assert H.dc_gain() == sp.zoo
+
+    def test_zero_over_zero(self):
+        s = sp.Symbol("s")
+        H = tfs((s**2 + s) / (s**3 + 2 * s), s=s)
+        assert H.dc_gain() is sp.nan
+
+    def test_time_delay(self):
+        s = sp.Symbol("s")
+        H = tfs(sp.exp(-s) / (s + 1), s=s)
+        assert H.dc_gain() == 1
+        assert H.zeros() == {}
+
+
+class TestPolyRepresentation:
+    def test_factor_cancels_common_factors(self):
+        s = sp.Symbol("s")
+        a = sp.Symbol("a", positive=True)
+        H = tfs((s + a) * (s + 2) / ((s + a) * (s**2 + 2 * s + 5)), s=s)
+        K, factors = H.factor(check=True)
+        assert len(factors) == 2  # (s + a) cancelled
+        assert sp.cancel(K * sp.Mul(*factors) - H.H) == 0
+
+    def test_parametric_roots(self):
+        s = sp.Symbol("s")
+        a = sp.Symbol("a", positive=True)
+        H = tfs((s - a) / (s**2 + 3 * a * s + 2 * a**2), s=s)
+        assert H.poles() == {-a: 1, -2 * a: 1}
+        assert H.zeros() == {a: 1}
+
+
+class TestNumericFactor:
+    H_expr = "(2430.0*s + 810.0)/(30.0*s**3 + 271.0*s**2 + 2439.0*s + 81.0)"
+
+    def test_matches_symbolic(self):
+        s = sp.Symbol("s")
+        H = tfs(sp.sympify(self.H_expr, locals={"s": s}), s=s)
+        K, factors = H.factor(check=True)
+        K_sym, factors_sym = H.factor(numeric=False)
+        assert abs(K - K_sym) < 1e-9
+        assert len(factors) == len(factors_sym)
+        for f, f_sym in zip(factors, factors_sym):
+            assert abs(sp.N((f - f_sym).subs(s, 1 + 2j))) < 1e-9
+
+    def test_rational_snapping(self):
+        s = sp.Symbol("s")
+        H = tfs(sp.sympify(self.H_expr, locals={"s": s}), s=s)
+        K, factors = H.factor(max_denominator=1000, check=True)
+        assert K == 10
+        assert factors == [1 / (30 * s + 1), 81 / (s**2 + 9 * s + 81), 3 * s + 1]
+        assert H.poles(max_denominator=1000)[sp.Rational(-1, 30)] == 1
+
+    def test_high_degree_and_origin(self):
+        s = sp.Symbol("s")
+        den = sp.expand(s**2 * sp.Mul(*[(s + 0.5 * k) for k in range(1, 11)]))
+        H = tfs(1.0 / den, s=s)
+        K, factors = H.factor(check=True)
+        assert factors[:2] == [1 / s, 1 / s]
+        assert len(factors) == 12
+
+    def test_poles_and_zeros(self):
+        s = sp.Symbol("s")
+        H = tfs((s + 3.0) / (s + 1.0)**2, s=s)
+        poles = H.poles()
+        assert sum(poles.values()) == 2
+        assert all(abs(p + 1) < 1e-6 for p in poles)
+        assert H.poles(max_denominator=100) == {-1: 2}
+        assert H.zeros() == {sp.Float(-3): 1}
+
+    def test_exact_coefficients_stay_symbolic(self):
+        s = sp.Symbol("s")
+        H = tfs(1 / (s**2 + 2), s=s)
+        assert H.poles() == {sp.sqrt(2) * sp.I: 1, -sp.sqrt(2) * sp.I: 1}
+        assert H.poles(numeric=True).keys() != H.poles().keys()
+
+    def test_parameters_cannot_be_numeric(self):
+        s = sp.Symbol("s")
+        a = sp.Symbol("a")
+        with pytest.raises(RuntimeError):
+            tfs(1 / (s + a), s=s).poles(numeric=True)
+
 
 class TestFactor:
     def test_first_order(self):
@@ -208,3 +311,205 @@ class TestFactorExample:
         # Should not raise — that's the main check
         assert K is not None
         assert len(factors) > 0
+
+
+class TestCompile:
+    def test_batch_coefficients(self):
+        s, a, b = sp.symbols("s a b")
+        H = tfs(b / (s**2 + a * s + 1), s=s)
+        f = H.compile([a, b])
+        num, den = f([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+        np.testing.assert_allclose(num, [[2.0], [4.0], [6.0]])
+        np.testing.assert_allclose(den, [[1, 1, 1], [1, 3, 1], [1, 5, 1]])
+
+    def test_dict_of_arrays(self):
+        s, a = sp.symbols("s a")
+        H = tfs(1 / (s + a), s=s)
+        num, den = H.compile()({a: np.array([1.0, 2.0])})
+        np.testing.assert_allclose(den, [[1, 1], [1, 2]])
+
+    def test_cached(self):
+        s, a = sp.symbols("s a")
+        H = tfs(1 / (s + a), s=s)
+        assert H.compile([a]) is H.compile([a])
+
+    def test_missing_param_raises(self):
+        s, a = sp.symbols("s a")
+        H = tfs(1 / (s + a), s=s)
+        with pytest.raises(RuntimeError):
+            H.compile([])
+
+    def test_to_control_matches(self):
+        s, a = sp.symbols("s a")
+        H = tfs(2 / (s**2 + a * s + 4), s=s)
+        H_ctrl = H.to_control(params={a: 3})
+        np.testing.assert_allclose(np.array(H_ctrl.den).flatten(), [1, 3, 4])
+        np.testing.assert_allclose(np.array(H_ctrl.num).flatten(), [2])
+
+
+class TestFrequencyResponse:
+    def test_matches_symbolic(self):
+        s, a = sp.symbols("s a")
+        H = tfs((s + 2) / (s**2 + a * s + 4), s=s)
+        w = np.array([0.0, 0.5, 2.0, 10.0])
+        values = np.array([[1.0], [3.0]])
+        G = H.frequency_response(w, values)
+        assert G.shape == (2, 4)
+        for i, a_ in enumerate(values[:, 0]):
+            for j, w_ in enumerate(w):
+                expected = complex(H.H.subs({a: a_, s: 1j * w_}))
+                assert np.isclose(G[i, j], expected)
+
+    def test_no_params(self):
+        s = sp.Symbol("s")
+        H = tfs(1 / (s + 1), s=s)
+        G = H.frequency_response([0.0, 1.0])
+        np.testing.assert_allclose(G, [[1.0, 1 / (1 + 1j)]])
+
+
+class TestForcedResponseResidues:
+    @pytest.mark.parametrize(
+        "H_expr",
+        [
+            "1/(s**2 + 2*s + 5)",
+            "(s + 3)/((s + 1)**2*(s + 2))",
+            "10/(s**3 + 6*s**2 + 11*s + 6)",
+            "s/(s**2 + 4)",
+        ],
+    )
+    def test_step_matches_sympy(self, H_expr):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(sp.sympify(H_expr, locals={"s": s}), s=s)
+        y = H.forced_response(t, U=1 / s, method="residues")
+        y_sympy = H.forced_response(t, U=1 / s, method="sympy")
+        assert sp.simplify(y - y_sympy) == 0
+
+    def test_symbolic_parameters(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        a = sp.Symbol("a", positive=True)
+        H = tfs(a / (s + a), s=s)
+        y = H.forced_response(t, u=sp.Heaviside(t), method="residues")
+        assert sp.simplify(y - (1 - sp.exp(-a * t))) == 0
+
+    def test_impulse_real_form(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s**2 + 2 * s + 5), s=s)
+        y = H.forced_response(t, U=sp.Integer(1), method="residues")
+        assert not y.has(sp.I)
+        assert sp.simplify(y - sp.exp(-t) * sp.sin(2 * t) / 2) == 0
+
+    def test_memoized(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s + 1), s=s)
+        y = H.forced_response(t, U=1 / s, method="residues")
+        assert H.forced_response(t, U=1 / s, method="residues") is y
+
+    def test_nonrational_input_falls_back(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s + 1), s=s)
+        y = H.forced_response(t, U=sp.exp(-s) / s, method="residues")  # Delayed step
+        expected = (1 - sp.exp(1 - t)) * sp.Heaviside(t - 1)
+        assert sp.simplify(y - expected) == 0
+
+    def test_repeated_float_poles(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1.0 / (s + 1.0)**3, s=s)
+        y = sp.lambdify(t, H.forced_response(t, U=1 / s, method="residues"))
+        x = np.linspace(0, 10, 50)
+        expected = 1 - (1 + x + x**2 / 2) * np.exp(-x)
+        assert np.allclose(y(x), expected, rtol=0, atol=1e-12)
+
+    def test_nonrational_plant_falls_back(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t")
+        H = tfs(sp.exp(-s) / (s + 1), s=s)  # Time delay
+        y = H.forced_response(t, u=1, method="residues")
+        expected = (1 - sp.exp(1 - t)) * sp.Heaviside(t - 1)
+        assert sp.simplify(y - expected) == 0
+
+    def test_real_form_for_plain_time_symbol(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t")
+        H = tfs(1 / (s**2 + 2 * s + 5)**2, s=s)
+        y = H.forced_response(t, U=1 / s, method="residues")
+        assert not y.has(sp.I)
+        y_sympy = H.forced_response(t, U=1 / s, method="sympy")
+        x = np.linspace(0.1, 3, 10)
+        assert np.allclose(sp.lambdify(t, y)(x), sp.lambdify(t, y_sympy)(x))
+
+    def test_parametric_underdamped_default_is_real(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", real=True)
+        a, b, c = sp.symbols("a b c", positive=True)
+        H = tfs((s + 2) / (a * s**2 + b * s + c), s=s)
+        y = H.forced_response(t, u=sp.Heaviside(t))
+        f = sp.lambdify((t, a, b, c), y, "numpy")
+        x = np.array([0.5, 1.0, 2.0])
+        H_num = tfs((s + 2) / (s**2 + s + 1), s=s)
+        y_num = sp.lambdify(t, H_num.forced_response(t, U=1 / s, method="residues"))
+        assert np.allclose(f(x, 1, 1, 1), y_num(x))
+
+
+class TestForcedResponseSimplify:
+    def test_policies_agree(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s**2 + 2 * s + 5), s=s)
+        y = H.forced_response(t, U=1 / s, method="residues")
+        for policy in ["none", "cheap", "full"]:
+            y_policy = H.forced_response(t, U=1 / s, method="residues", simplify=policy)
+            assert sp.simplify(y_policy - y) == 0
+        assert H.forced_response(t, U=1 / s, method="residues", simplify="none") is y
+        y_full = H.forced_response(t, U=1 / s, method="residues", simplify="full")
+        assert H.forced_response(t, U=1 / s, method="residues", simplify="full") is y_full
+        assert sp.count_ops(y_full) <= sp.count_ops(y)
+
+    def test_sympy_method_simplified_by_default(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s + 1), s=s)
+        y = H.forced_response(t, U=1 / s, method="sympy")
+        assert y == sp.simplify(
+            H.forced_response(t, U=1 / s, method="sympy", simplify="none")
+        )
+
+    def test_timeout(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s + 1), s=s)
+        y = H.forced_response(t, U=1 / s, simplify="full", timeout=60)
+        assert sp.simplify(y - (1 - sp.exp(-t))) == 0
+        Y = H.forced_response(t, U=1 / s, laplace=True, simplify="none")
+        assert Y == 1 / (s * (s + 1))
+
+
+class TestNumeric:
+    def test_matches_lambdify(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", positive=True)
+        H = tfs(1 / (s**2 + 2 * s + 5), s=s)
+        f = H.numeric(t, U=1 / s)
+        y = sp.lambdify(t, H.forced_response(t, U=1 / s), "numpy")
+        x = np.linspace(0, 3, 20)
+        assert np.allclose(f(x), y(x))
+        assert H.numeric(t, U=1 / s) is f
+
+    def test_parametric_underdamped_matches_baseline(self):
+        s = sp.Symbol("s")
+        t = sp.Symbol("t", real=True)
+        a, b, c = sp.symbols("a b c", positive=True)
+        H = tfs((s + 2) / (a * s**2 + b * s + c), s=s)
+        f = H.numeric(t, u=sp.Heaviside(t), params=(a, b, c))
+        Y = (H.H / s).simplify()
+        y = sp.inverse_laplace_transform(Y, s, t, noconds=True).simplify()
+        y = sp.lambdify((t, a, b, c), y, "numpy")
+        x = np.array([0.5, 1.0, 2.0])
+        for values in [(1, 1, 1), (2, 1, 3)]:  # Underdamped
+            assert np.allclose(f(x, *values), y(x, *values))
+            assert np.isrealobj(f(x, *values))